@@ -0,0 +1,75 @@
+"""Benchmark for lib.pages against the page lists it replaced.
+
+Paginates long lyrics with the old paragraph concatenation loop from
+commands/music.py and with paginate_text, and the pages of a 10,000 track playlist
+as a list of page strings and with paginate_lines. Reports build time and the memory
+held by the result, and checks that no text is lost and pages stay within the limit.
+
+Run from the repository root: python -m benchmarks.pages
+"""
+
+import random
+import string
+import sys
+import timeit
+
+from lib.pages import paginate_lines, paginate_text
+from lib.spotify_embeds import PAGE_LIMIT, join_lines
+
+def random_lyrics(rng, paragraphs = 400):
+    lines = lambda: "\n".join(" ".join("".join(rng.choice(string.ascii_lowercase) for i in range(rng.randint(2, 9))) for i in range(rng.randint(3, 10))) for i in range(rng.randint(2, 8)))
+    return "\n\n".join(lines() for i in range(paragraphs))
+
+def random_lines(rng, count = 10000):
+    return [f"{i}. **{''.join(rng.choice(string.ascii_letters) for i in range(rng.randint(5, 60)))}** - Artist" for i in range(1, count + 1)]
+
+# The loop previously used for lyrics pages in commands/music.py
+def old_lyrics_pages(lyrics, limit = 1600):
+    paged_lyrics = []
+    current_page = ""
+
+    for paragraph in lyrics.split("\n\n"):
+        if len(paragraph) + len(current_page) < limit:
+            current_page = current_page + "\n\n" + paragraph
+        else:
+            paged_lyrics.append(current_page)
+            current_page = paragraph
+
+    paged_lyrics.append(current_page)
+    return paged_lyrics
+
+# The page lists previously built by lib.playlist_pages.render_pages()
+def old_line_pages(lines, per_page = 25):
+    return [join_lines(lines[offset:offset + per_page], PAGE_LIMIT) for offset in range(0, len(lines), per_page)]
+
+def size_of_list(pages):
+    return sys.getsizeof(pages) + sum(sys.getsizeof(page) for page in pages)
+
+# Only what the pages add, the source text is already held by the caller's cache
+def size_of_pages(pages, text_shared):
+    return sys.getsizeof(pages) + sys.getsizeof(pages.offsets) + (0 if text_shared else sys.getsizeof(pages.source))
+
+def bench(func, repeat = 5, number = 20):
+    return min(timeit.repeat(func, number = number, repeat = repeat)) / number * 1e6
+
+def report(name, old_time, new_time, old_size, new_size):
+    print(f"{name}: old {old_time:,.0f} us / {old_size / 1024:,.1f} KiB, new {new_time:,.0f} us / {new_size / 1024:,.1f} KiB ({old_time / new_time:.1f}x time, {old_size / new_size:.1f}x memory)")
+
+def main():
+    rng = random.Random(0)
+    lyrics = random_lyrics(rng)
+    lines = random_lines(rng)
+
+    old_pages = old_lyrics_pages(lyrics)
+    new_pages = paginate_text(lyrics, "\n\n", 1600)
+    # The old loop didn't count the separators, so page breaks can differ, the text can't
+    assert "\n\n".join(new_pages) == lyrics and all(len(page) <= 1600 for page in new_pages)
+    report(f"Lyrics, {len(lyrics):,} characters, {len(new_pages)} pages", bench(lambda: old_lyrics_pages(lyrics)), bench(lambda: paginate_text(lyrics, "\n\n", 1600)), size_of_list(old_pages), size_of_pages(new_pages, True))
+
+    old_pages = old_line_pages(lines)
+    new_pages = paginate_lines(lines, 25, limit = PAGE_LIMIT)
+    assert old_pages == list(new_pages)
+    report(f"10k line playlist, {len(new_pages)} pages", bench(lambda: old_line_pages(lines), number = 5), bench(lambda: paginate_lines(lines, 25, limit = PAGE_LIMIT), number = 5), size_of_list(old_pages), size_of_pages(new_pages, False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark for the NumPy palette engine against ColorThief.get_color(quality=1).
+
+For every cover, ColorThief runs on the 640px image (what the bot used to do), and
+lib.palette runs on the same 640px image and on a 300px variant, to check whether the
+smaller Spotify variant is good enough. Reports ms/image and how often the dominant
+colours agree with ColorThief within TOLERANCE per channel.
+
+Covers are read from a directory of images if one is given, otherwise a synthetic
+fixture set is generated. Needs colorthief installed for the comparison.
+
+Run from the repository root: python -m benchmarks.palette [cover directory]
+"""
+
+from colorthief import ColorThief
+from PIL import Image, ImageFilter
+import numpy as np
+import pathlib
+import time
+import sys
+import io
+
+from lib.palette import get_color
+
+# Maximum difference per channel for two colours to count as agreeing
+TOLERANCE = 16
+
+def synthetic_covers(count = 24, seed = 0):
+    rng = np.random.default_rng(seed)
+    covers = []
+
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            # Flat background with a block of a second colour
+            array = np.empty((640, 640, 3), np.uint8)
+            array[:] = rng.integers(0, 256, 3)
+            array[160:480, 160:480] = rng.integers(0, 256, 3)
+        elif kind == 1:
+            # Diagonal gradient between two colours
+            t = np.add.outer(np.arange(640), np.arange(640))[..., None] / 1278
+            array = ((1 - t) * rng.integers(0, 256, 3) + t * rng.integers(0, 256, 3)).astype(np.uint8)
+        elif kind == 2:
+            # Blurred noise, looks a bit like a photo
+            array = rng.integers(0, 256, (40, 40, 3), dtype = np.uint8)
+            array = np.asarray(Image.fromarray(array).resize((640, 640), Image.BICUBIC).filter(ImageFilter.GaussianBlur(8)))
+        else:
+            # Mostly white artwork with some text-like dark specks
+            array = np.full((640, 640, 3), 252, np.uint8)
+            mask = rng.random((640, 640)) < 0.15
+            array[mask] = rng.integers(0, 120, 3)
+
+        buffer = io.BytesIO()
+        Image.fromarray(array).save(buffer, "JPEG", quality = 90)
+        covers.append(buffer.getvalue())
+
+    return covers
+
+def directory_covers(path):
+    return [file.read_bytes() for file in sorted(pathlib.Path(path).iterdir()) if file.is_file()]
+
+def variant(data, size):
+    image = Image.open(io.BytesIO(data)).convert("RGB")
+    image.thumbnail((size, size))
+
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality = 90)
+    return buffer.getvalue()
+
+def numpy_color(data):
+    return get_color(np.asarray(Image.open(io.BytesIO(data)).convert("RGBA")))
+
+def colorthief_color(data):
+    return ColorThief(io.BytesIO(data)).get_color(quality = 1)
+
+def timed(func, covers):
+    results = []
+
+    start = time.perf_counter()
+    for data in covers:
+        results.append(func(data))
+
+    return results, (time.perf_counter() - start) / len(covers) * 1000
+
+def agreement(reference, results):
+    close = sum(max(abs(a - b) for a, b in zip(x, y)) <= TOLERANCE for x, y in zip(reference, results))
+    return close / len(reference) * 100
+
+def main():
+    covers = directory_covers(sys.argv[1]) if len(sys.argv) > 1 else synthetic_covers()
+    small = [variant(data, 300) for data in covers]
+
+    reference, colorthief_ms = timed(colorthief_color, covers)
+    full, full_ms = timed(numpy_color, covers)
+    reduced, reduced_ms = timed(numpy_color, small)
+
+    print(f"{len(covers)} covers")
+    print(f"ColorThief quality=1, 640px: {colorthief_ms:8.1f} ms/image")
+    print(f"lib.palette, 640px:          {full_ms:8.1f} ms/image, {agreement(reference, full):5.1f}% agree")
+    print(f"lib.palette, 300px:          {reduced_ms:8.1f} ms/image, {agreement(reference, reduced):5.1f}% agree")
+
+if __name__ == "__main__":
+    main()
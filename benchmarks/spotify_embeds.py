@@ -0,0 +1,116 @@
+"""Micro-benchmark for lib.spotify_embeds against the string building it replaced.
+
+Renders a 50 track album and the pages of a 10,000 track playlist with the old
+per-line f-string concatenation and with the join based builders, plus the whole
+playlist as one list to show how the old approach grows with length. Also checks
+that every output stays within Discord's limits.
+
+Run from the repository root: python -m benchmarks.spotify_embeds
+"""
+
+import random
+import string
+import timeit
+
+from lib.playlist_pages import render_pages
+from lib.spotify_embeds import DESCRIPTION_LIMIT, TITLE_LIMIT, album_embed, join_lines, track_line
+from lib.spotify_models import Album, Artist, Image, Track
+
+def random_name(rng, length):
+    return "".join(rng.choice(string.ascii_letters + "   *") for i in range(length)).strip() or "x"
+
+def random_track(rng, number):
+    artists = tuple(Artist(f"artist{number}-{i}", random_name(rng, rng.randint(4, 24))) for i in range(rng.choice((1, 1, 2, 3))))
+    return Track(f"track{number}", random_name(rng, rng.randint(5, 60)), f"https://open.spotify.com/track/track{number}", artists = artists)
+
+def build_album(size = 50, seed = 0):
+    rng = random.Random(seed)
+    return Album("album", "Benchmark Album", "https://open.spotify.com/album/album", (Artist("artist", "Benchmark Artist"),), (Image("https://i.scdn.co/image/ab67616d0000b273", 640, 640),), tuple(random_track(rng, i) for i in range(size)))
+
+def build_playlist_items(size = 10000, seed = 1):
+    rng = random.Random(seed)
+    return tuple(None if rng.random() < 0.01 else random_track(rng, i) for i in range(size))
+
+# The loop previously used for album track lists in commands/song_url.py
+def old_track_list(tracks):
+    songlist_string = ""
+    for i in range(len(tracks)):
+        artist_string = ""
+        for artist in tracks[i].artists:
+            if artist_string == "":
+                artist_string = artist.name.replace('*', '-')
+            else:
+                artist_string = artist_string + ", " + artist.name.replace('*', '-')
+
+        if len(tracks[i].artists) == 1:
+            if songlist_string == "":
+                songlist_string = f"{i + 1}. **{tracks[i].name.replace('*', '-')}**"
+            else:
+                songlist_string += f"\n{i + 1}. **{tracks[i].name.replace('*', '-')}**"
+        else:
+            if songlist_string == "":
+                songlist_string = f"{i + 1}. **{tracks[i].name.replace('*', '-')}** - {artist_string}"
+            else:
+                songlist_string += f"\n{i + 1}. **{tracks[i].name.replace('*', '-')}** - {artist_string}"
+
+    return songlist_string
+
+# The loop previously used for playlist pages in commands/spotify_autoembed.py
+def old_playlist_pages(items, page_size = 25):
+    i = 0
+    pages = []
+    pageStr = ""
+
+    for playlist_item in items:
+        i += 1
+        artist_string = ""
+
+        if playlist_item == None:
+            if pageStr == "":
+                pageStr = f"**{i}.** *(Media Unavailable)*"
+            else:
+                pageStr = f"{pageStr}\n**{i}.** *(Media Unavailable)*"
+        else:
+            for artist in playlist_item.artists:
+                if artist_string == "":
+                    artist_string = artist.name
+                else:
+                    artist_string = f"{artist_string}, {artist.name}"
+
+            if pageStr == "":
+                pageStr = f"**{i}: {playlist_item.name.replace('*', '-')}** - {artist_string}"
+            else:
+                pageStr = f"{pageStr}\n**{i}: {playlist_item.name.replace('*', '-')}** - {artist_string}"
+
+        if i % page_size == 0:
+            pages.append(pageStr)
+            pageStr = ""
+
+    if pageStr != "":
+        pages.append(pageStr)
+
+    return pages
+
+def bench(func, repeat = 5, number = 20):
+    return min(timeit.repeat(func, number = number, repeat = repeat)) / number * 1e6
+
+def report(name, old, new):
+    print(f"{name}: old {old:,.0f} us, new {new:,.0f} us ({old / new:.1f}x)")
+
+def main():
+    album = build_album()
+    items = build_playlist_items()
+
+    report("50 track album", bench(lambda: old_track_list(album.tracks)), bench(lambda: join_lines([track_line(i, track) for i, track in enumerate(album.tracks, 1)], DESCRIPTION_LIMIT)))
+    report("10k track playlist pages", bench(lambda: old_playlist_pages(items), number = 2), bench(lambda: render_pages(items), number = 2))
+    report("10k track playlist as one list", bench(lambda: old_playlist_pages(items, len(items)), number = 1), bench(lambda: render_pages(items, page_size = len(items)), number = 1))
+
+    # Outputs must be sendable, even for names and lists over the limits
+    long_album = Album("album", "x" * 300, artists = (Artist("artist", "y" * 300),), images = album.images, tracks = tuple(item for item in items[:1000] if item != None))
+    embed = album_embed(long_album)
+    assert len(embed.title) <= TITLE_LIMIT and len(embed.description) <= DESCRIPTION_LIMIT
+    assert all(len(page) <= DESCRIPTION_LIMIT for page in render_pages(items))
+    print(f"Limits ok, 1000 track album description: {len(embed.description)} characters, ends with {embed.description.splitlines()[-1]}")
+
+if __name__ == "__main__":
+    main()
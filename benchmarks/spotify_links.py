@@ -0,0 +1,60 @@
+"""Micro-benchmark for the Spotify link extractor used by the autoembed cog.
+
+Compares the per-message cost of the old generic URL regex (plus substring
+filtering) against lib.spotify_links.extract_links over a corpus of chat messages.
+
+Run from the repository root: python -m benchmarks.spotify_links
+"""
+
+import random
+import re
+import timeit
+
+from lib.spotify_links import extract_links
+
+# The generic URL regex previously used by spotify_autoembed.on_message
+OLD_URL_REGEX = r"\b((?:https?://)?(?:(?:www\.)?(?:[\da-z\.-]+)\.(?:[a-z]{2,6})|(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)|(?:(?:[0-9a-fA-F]{1,4}:){7,7}[0-9a-fA-F]{1,4}|(?:[0-9a-fA-F]{1,4}:){1,7}:|(?:[0-9a-fA-F]{1,4}:){1,6}:[0-9a-fA-F]{1,4}|(?:[0-9a-fA-F]{1,4}:){1,5}(?::[0-9a-fA-F]{1,4}){1,2}|(?:[0-9a-fA-F]{1,4}:){1,4}(?::[0-9a-fA-F]{1,4}){1,3}|(?:[0-9a-fA-F]{1,4}:){1,3}(?::[0-9a-fA-F]{1,4}){1,4}|(?:[0-9a-fA-F]{1,4}:){1,2}(?::[0-9a-fA-F]{1,4}){1,5}|[0-9a-fA-F]{1,4}:(?:(?::[0-9a-fA-F]{1,4}){1,6})|:(?:(?::[0-9a-fA-F]{1,4}){1,7}|:)|fe80:(?::[0-9a-fA-F]{0,4}){0,4}%[0-9a-zA-Z]{1,}|::(?:ffff(?::0{1,4}){0,1}:){0,1}(?:(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])|(?:[0-9a-fA-F]{1,4}:){1,4}:(?:(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])))(?::[0-9]{1,4}|[1-5][0-9]{4}|6[0-4][0-9]{3}|65[0-4][0-9]{2}|655[0-2][0-9]|6553[0-5])?(?:/[\w\.-]*)*/?)\b"
+
+def old_extract(content):
+    if "https://open.spotify.com/" in content:
+        return [url for url in re.findall(OLD_URL_REGEX, content) if "https://open.spotify.com/" in url]
+    return []
+
+def build_corpus(size = 10000, seed = 0):
+    rng = random.Random(seed)
+    plain = [
+        "lol",
+        "anyone up for a game later?",
+        "I can't believe that actually worked, thanks for the help yesterday",
+        "check the pins for the rules, and please don't ping the mods for every little thing",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "see https://github.com/example/project/issues/42 for the details",
+        "my ip is 192.168.1.20 but that won't help you lol",
+        "ok",
+    ]
+    spotify = [
+        "this is so good https://open.spotify.com/track/4cOdK2wGLETKBW3PvgPWqT?si=abc123",
+        "https://open.spotify.com/intl-de/album/1ATL5GLyefJaxhQzSPVrLX",
+        "made a playlist for the trip https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M?si=1a2b3c4d5e6f and also https://open.spotify.com/artist/0TnOYISbd1XYRBk9myaseg",
+        "https://spotify.link/AbCdEfGhIjK",
+        "open.spotify.com links are the best",
+    ]
+
+    # Roughly one in ten messages mentions Spotify
+    return [rng.choice(spotify) if rng.random() < 0.1 else rng.choice(plain) for i in range(size)]
+
+def bench(func, corpus, repeat = 5):
+    best = min(timeit.repeat(lambda: [func(message) for message in corpus], number = 1, repeat = repeat))
+    return best / len(corpus) * 1e9
+
+def main():
+    corpus = build_corpus()
+    spotify_corpus = [message for message in corpus if "spotify" in message]
+
+    for name, messages in (("all messages", corpus), ("spotify messages", spotify_corpus)):
+        old = bench(old_extract, messages)
+        new = bench(extract_links, messages)
+        print(f"{name} ({len(messages)}): old {old:,.0f} ns/msg, new {new:,.0f} ns/msg ({old / new:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ import aiohttp
 import os
 from pathlib import Path
 
+from lib.responses import AdaptiveResponse
+
 class animals(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -22,20 +24,15 @@ class animals(commands.Cog):
     @animalGroup.command(name = "cat", description = "Get a random cat picture.")
     @app_commands.checks.cooldown(1, 5)
     async def cat(self, interaction: discord.Interaction):
-        await interaction.response.defer()
+        responder = AdaptiveResponse(interaction, "animals-cat")
 
-        # Send initial embed
-        embed = discord.Embed(title = "Loading...", color = Color.orange())
-        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-        await interaction.followup.send(embed = embed)
-        
         try:
             # Fetch image
             async with aiohttp.ClientSession() as session:
                 async with session.get("https://api.thecatapi.com/v1/images/search") as request:
                     if request.status == 429:
                         embed = discord.Embed(title = "The service has been rate limited. Try again later.", color = Color.red())
-                        await interaction.edit_original_response(embed = embed)
+                        await responder.update(embed = embed)
                         return
                     else:
                         request_data = await request.json()
@@ -47,29 +44,24 @@ class animals(commands.Cog):
             embed.set_image(url = request_data[0]["url"])
             embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
 
-            await interaction.edit_original_response(embed = embed)
+            await responder.update(embed = embed)
         except Exception:
             embed = discord.Embed(title = "Unexpected Error", description = "Please try again later or message <@563372552643149825> for assistance.", color = Color.red())
-            await interaction.edit_original_response(embed = embed)
+            await responder.update(embed = embed)
 
     # Dog command
     @animalGroup.command(name = "dog", description = "Get a random dog picture.")
     @app_commands.checks.cooldown(1, 5)
     async def dog(self, interaction: discord.Interaction):
-        await interaction.response.defer()
+        responder = AdaptiveResponse(interaction, "animals-dog")
 
-        # Send initial embed
-        embed = discord.Embed(title = "Loading...", color = Color.orange())
-        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-        await interaction.followup.send(embed = embed)
-        
         try:
             # Fetch image
             async with aiohttp.ClientSession() as session:
                 async with session.get("https://dog.ceo/api/breeds/image/random") as request:
                     if request.status == 429:
                         embed = discord.Embed(title = "The service has been rate limited. Try again later.", color = Color.red())
-                        await interaction.edit_original_response(embed = embed)
+                        await responder.update(embed = embed)
                         return
                     else:
                         request_data = await request.json()
@@ -81,21 +73,16 @@ class animals(commands.Cog):
             embed.set_image(url = request_data["message"])
             embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
             
-            await interaction.edit_original_response(embed = embed)
+            await responder.update(embed = embed)
         except Exception:
             embed = discord.Embed(title = "Unexpected Error", description = "Please try again later or message <@563372552643149825> for assistance.", color = Color.red())
-            await interaction.edit_original_response(embed = embed)
+            await responder.update(embed = embed)
     
     # Sand Cat command
     @animalGroup.command(name = "sand-cat", description = "Get a random sand cat picture.")
     @app_commands.checks.cooldown(1, 5)
     async def sand_cat(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        
-        # Send initial embed
-        embed = discord.Embed(title = "Loading...", color = Color.orange())
-        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-        await interaction.followup.send(embed = embed)
+        responder = AdaptiveResponse(interaction, "animals-sand-cat")
         
         try:
             target_file = random.choice(self.sandcat_files)
@@ -108,10 +95,10 @@ class animals(commands.Cog):
             
             embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
             
-            await interaction.edit_original_response(attachments=[file], embed = embed)
+            await responder.update(attachments=[file], embed = embed)
         except Exception:
             embed = discord.Embed(title = "Unexpected Error", description = "Please try again later or message <@563372552643149825> for assistance.", color = Color.red())
-            await interaction.edit_original_response(embed = embed, file = None)
+            await responder.update(embed = embed, attachments = [])
 
 async def setup(bot):
     await bot.add_cog(animals(bot))
\ No newline at end of file
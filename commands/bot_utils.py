@@ -8,6 +8,9 @@ import psutil
 import os
 import time
 
+from lib.cache import registry as cache_registry
+from lib.responses import stats as response_stats
+
 class bot_utils(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -29,7 +32,7 @@ class bot_utils(commands.Cog):
     async def info(self, interaction: discord.Interaction):
         await interaction.response.defer()
         embed = discord.Embed(title = "Info")
-        embed.add_field(name = "Credit", value = "Bot created by Restart (<@563372552643149825>)\n\nBot Framework\n[discord.py](https://github.com/Rapptz/discord.py)\n\nAPIs and Modules:\n[Cat API](https://thecatapi.com/)\n[Dog API](https://dog.ceo/dog-api/)\n[Lyrics API](https://lrclib.net/)\n[Spotipy Module](https://github.com/spotipy-dev/spotipy)\n[Wikipedia Module](https://github.com/goldsmith/Wikipedia)")
+        embed.add_field(name = "Credit", value = "Bot created by Restart (<@563372552643149825>)\n\nBot Framework\n[discord.py](https://github.com/Rapptz/discord.py)\n\nAPIs and Modules:\n[Cat API](https://thecatapi.com/)\n[Dog API](https://dog.ceo/dog-api/)\n[Lyrics API](https://lrclib.net/)\n[Spotify Web API](https://developer.spotify.com/documentation/web-api)\n[Wikipedia Module](https://github.com/goldsmith/Wikipedia)")
         await interaction.followup.send(embed = embed)
 
     # Host Info command
@@ -60,6 +63,25 @@ class bot_utils(commands.Cog):
 
         await interaction.edit_original_response(embed = embed)
 
+    # Response Stats command
+    @botGroup.command(name = "response-stats", description = "Admin Only: view how often commands respond without deferring.")
+    async def response_stats(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral = True)
+
+        if interaction.user.id in self.bot.dev_ids:
+            embed = discord.Embed(title = "Response Stats", color = Color.random())
+
+            for name, stats in sorted(response_stats().items()):
+                embed.add_field(name = name, value = f"**Fast:** {stats['fast']:,}\n**Deferred:** {stats['slow']:,}\n**Fast Rate:** {stats['fast_rate']:.1%}")
+
+            if len(embed.fields) == 0:
+                embed.description = "No commands have responded yet."
+
+            await interaction.followup.send(embed = embed, ephemeral = True)
+        else:
+            embed = discord.Embed(title = "You do not have permission to run this command.", color = Color.red())
+            await interaction.followup.send(embed = embed, ephemeral = True)
+
     # Send Message command
     @botGroup.command(name = "clear-console", description = "Admin Only: clear the console.")
     async def clear_console(self, interaction: discord.Interaction,):
@@ -73,6 +95,26 @@ class bot_utils(commands.Cog):
             embed = discord.Embed(title = "You do not have permission to run this command.", color = Color.red())
             await interaction.followup.send(embed = embed, ephemeral = True)
     
+    # Cache Stats command
+    @botGroup.command(name = "cache-stats", description = "Admin Only: view cache hit rates.")
+    async def cache_stats(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral = True)
+
+        if interaction.user.id in self.bot.dev_ids:
+            embed = discord.Embed(title = "Cache Stats", color = Color.random())
+
+            for name, cache in sorted(cache_registry.items()):
+                stats = cache.stats()
+                embed.add_field(name = name, value = f"**Size:** {stats['size']:,}/{stats['maxsize']:,}\n**Hits:** {stats['hits']:,}\n**Misses:** {stats['misses']:,}\n**Hit Rate:** {stats['hit_rate']:.1%}\n**Evictions:** {stats['evictions']:,}")
+
+            if len(embed.fields) == 0:
+                embed.description = "No caches are loaded."
+
+            await interaction.followup.send(embed = embed, ephemeral = True)
+        else:
+            embed = discord.Embed(title = "You do not have permission to run this command.", color = Color.red())
+            await interaction.followup.send(embed = embed, ephemeral = True)
+
     # Send Message command
     @botGroup.command(name = "send-message", description = "Admin Only: send debug message.")
     async def send_message(self, interaction: discord.Interaction, message: str, channel_id: str):
@@ -3,19 +3,147 @@ from discord import app_commands, Color
 import discord.ext
 from discord.ui import View
 from discord.ext import commands
-import sqlite3
 
 import discord.ext.tasks
 
+from lib.cache import TTLCache
+from lib.counter_buffer import CounterBuffer
+from lib.leaderboard_db import COLUMNS, LeaderboardStore, utc_day
+from lib.rank_index import RankIndex
+from lib.responses import AdaptiveResponse
+from lib.singleflight import SingleFlight
+from lib.views import ActionButton, register, unregister
+
+# Users per leaderboard page
+PAGE_SIZE = 10
+
+# How long the number of users on a leaderboard is cached for page numbers
+COUNT_TTL = 60
+
+# How long a server's rank indexes are kept after they were loaded, they are kept up to date while loaded
+RANKS_TTL = 60 * 60
+
+# Message counts are written to the database every FLUSH_INTERVAL seconds, or once FLUSH_MESSAGES messages are waiting
+FLUSH_INTERVAL = 30
+FLUSH_MESSAGES = 500
+
+# Ended day / week / month buckets are deleted every COMPACT_INTERVAL hours
+COMPACT_INTERVAL = 1
+
+# Sort columns and their names
+SORT_NAMES = {"messages": "Messages Sent", "words": "Words Sent", "attachments": "Attachments Sent"}
+
+# Leaderboard periods and their names, "all" is the all time totals
+PERIOD_NAMES = {"all": "All Time", "day": "Today", "week": "This Week", "month": "This Month"}
+
 class leaderboard(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.connection = sqlite3.connect(f"{self.bot.path}{self.bot.pathtype}content{self.bot.pathtype}sql{self.bot.pathtype}lb.db")
-        self.cursor = self.connection.cursor()
+        self.button_handlers = {"lb-page": self.page_button}
+
+        # (guild ID, period) -> number of users on its leaderboard
+        self.user_counts = TTLCache("leaderboard-counts", maxsize = 1024)
+
+        # Guild ID -> {column: RankIndex of every user's value}, loaded by /rank
+        self.rank_indexes = TTLCache("leaderboard-ranks", maxsize = 16)
+        self._rank_loads = SingleFlight()
+
+        # Leaderboard database, queried and written off the event loop
+        self.store = LeaderboardStore(f"{self.bot.path}{self.bot.pathtype}content{self.bot.pathtype}sql{self.bot.pathtype}lb.db")
+
+        # IDs of servers with the leaderboard enabled, loaded in cog_load() and kept in sync by enable / disable.
+        # Other cogs can check this with bot.get_cog("leaderboard").is_enabled(guild_id).
+        self.enabled_guilds = set()
+
+        # (guild ID, user ID, UTC day) -> [messages, words, attachments] waiting to be written. The day
+        # keeps counts made before midnight in that day's, week's and month's buckets when written later.
+        self.counts = CounterBuffer(self.write_counts, interval = FLUSH_INTERVAL, max_pending = FLUSH_MESSAGES)
 
         #self.optOutList = self.cursor.execute(f"SELECT userID FROM optOutList;").fetchall()
         self.optOutList = []
 
+    async def cog_load(self):
+        # Open the database, moving over per-server tables from older versions
+        migrated = await self.store.open()
+        if migrated > 0:
+            print(f"[LEADERBOARD] Migrated {migrated} servers to the stats table.")
+
+        self.enabled_guilds = await self.store.enabled_guilds()
+
+        register(self.bot, self.button_handlers)
+        self.counts.start()
+        self.compact_periods.start()
+
+    async def cog_unload(self):
+        unregister(self.bot, self.button_handlers)
+        self.compact_periods.cancel()
+
+        # Write any waiting counts before closing
+        try:
+            await self.counts.close()
+        except Exception as error:
+            print(f"Error occurred while saving leaderboard counts: {error}")
+
+        await self.store.close()
+
+    # Write buffered counts in one transaction
+    async def write_counts(self, counts):
+        # Skip servers that disabled the leaderboard since the counts were added
+        rows = [(guild_id, user_id, day, *totals) for (guild_id, user_id, day), totals in counts.items() if guild_id in self.enabled_guilds]
+        new_totals = await self.store.add_counts(rows)
+
+        # Move the users to their new values in loaded rank indexes. This runs straight after
+        # the write, before any later load, so the indexes stay in step with the database.
+        # A user can have rows for two days in one batch, they are applied in order
+        for (guild_id, user_id, day, *added), totals in zip(rows, new_totals):
+            if guild_id not in self.rank_indexes:
+                continue
+
+            # Every row is added with at least one message, so no messages before means a new user
+            new_user = totals[0] == added[0]
+
+            indexes = self.rank_indexes.get(guild_id)
+            for column, value, change in zip(COLUMNS, totals, added):
+                if not new_user:
+                    indexes[column].remove(value - change)
+                indexes[column].add(value)
+
+    # Delete day / week / month buckets once their period has ended, the current ones are
+    # kept up to date by every flush so period leaderboards never add anything up
+    @discord.ext.tasks.loop(hours = COMPACT_INTERVAL)
+    async def compact_periods(self):
+        try:
+            await self.store.compact()
+        except Exception as error:
+            print(f"Error occurred while compacting leaderboard periods: {error}")
+
+    # Forget cached counts and rank indexes for a server after its data changed
+    def forget_guild(self, guild_id: int):
+        for period in PERIOD_NAMES:
+            self.user_counts.pop((guild_id, period))
+
+        self.rank_indexes.pop(guild_id)
+
+    # Load a server's rank indexes, or get them if they're loaded
+    async def get_rank_indexes(self, guild_id: int):
+        indexes = self.rank_indexes.get(guild_id)
+
+        if indexes == None:
+            indexes = await self._rank_loads.do(guild_id, self._load_rank_indexes, guild_id)
+
+        return indexes
+
+    async def _load_rank_indexes(self, guild_id: int):
+        values = await self.store.column_values(guild_id)
+
+        indexes = {column: RankIndex(column_values) for column, column_values in values.items()}
+        self.rank_indexes.set(guild_id, indexes, RANKS_TTL)
+        return indexes
+
+    # Check if the leaderboard is enabled in a server
+    def is_enabled(self, guild_id: int):
+        return guild_id in self.enabled_guilds
+
     # # Refresh opt out list function
     # async def refreshOptOutList(self):
     #     try:
@@ -36,21 +164,9 @@ class leaderboard(commands.Cog):
         try:
             # Check if user is Bot
             if message.author.bot != True:
-                if not(message.author.id in self.optOutList):
-                    # Check if server is in DB
-                    if self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{str(message.guild.id)}';").fetchone() != None:
-                        # Check if user is already on leaderboard
-                        if self.cursor.execute(f"SELECT userMention FROM '{message.guild.id}' WHERE userMention = '{message.author.mention}';").fetchone() != None:
-                            # User is on the leaderboard, update their values
-                            self.cursor.execute(f"UPDATE '{message.guild.id}' SET messageCount = messageCount + 1, wordCount = wordCount + {len((message.content).split())}, attachmentCount = attachmentCount + {len(message.attachments)} WHERE userMention = ?", (message.author.mention,))
-                        else:
-                            # User is not on leaderboard, add them to the leaderboard
-                            self.cursor.execute(f"INSERT INTO '{message.guild.id}' (userMention, messageCount, wordCount, attachmentCount) VALUES (?, 1, {len((message.content).split())}, {len(message.attachments)})", (message.author.mention,))
-                        
-                        # Commit to DB
-                        self.connection.commit()
-                    else:
-                        pass
+                if message.guild != None and message.guild.id in self.enabled_guilds and not(message.author.id in self.optOutList):
+                    # Count the message, it's written to the DB with the next flush
+                    self.counts.add((message.guild.id, message.author.id, utc_day()), 1, len((message.content).split()), len(message.attachments))
             else:
                 pass
         # This should never happen, but if there is an error, log it
@@ -58,91 +174,145 @@ class leaderboard(commands.Cog):
             print("Error occurred while logging message for leaderboard!")
             print(error)
     
+    # Number of users on a server's leaderboard for a period, cached as it's only used for page numbers
+    async def user_count(self, guild_id: int, period: str = "all"):
+        count = self.user_counts.get((guild_id, period))
+
+        if count == None:
+            count = await self.store.count(guild_id, None if period == "all" else period)
+            self.user_counts.set((guild_id, period), count, COUNT_TTL)
+
+        return count
+
+    # Render a page of the leaderboard, step pages on from the page whose edge row has key
+    # (value, user ID). Only that page is read from the database, pages out of range wrap around.
+    # Periods other than "all" are read from the current period's buckets.
+    async def render_page(self, interaction: discord.Interaction, sort_type: str, page: int = 0, step: int = 0, key: tuple = None, period: str = "all"):
+        if not self.is_enabled(interaction.guild.id):
+            embed = discord.Embed(title = "Not Enabled", description = "The message leaderboard is not enabled in this server.", color = Color.red())
+            return embed, None
+
+        total = await self.user_count(interaction.guild.id, period)
+        page_count = max(1, -(-total // PAGE_SIZE))
+        page += step
+        store_period = None if period == "all" else period
+
+        vals = []
+        if key != None and 0 <= page < page_count:
+            vals = await self.store.page(interaction.guild.id, sort_type, key, forward = step > 0, limit = PAGE_SIZE, period = store_period)
+
+        if vals == []:
+            if page < 0:
+                # Went back from the first page, wrap around to the last
+                page = page_count - 1
+                vals = await self.store.page(interaction.guild.id, sort_type, forward = False, limit = total - page * PAGE_SIZE, period = store_period)
+            else:
+                page = 0
+                vals = await self.store.page(interaction.guild.id, sort_type, limit = PAGE_SIZE, period = store_period)
+
+        if vals == []:
+            description = "No Data"
+        else:
+            description = "\n".join(f"{i}. <@{val[0]}>: {val[1]}" for i, val in enumerate(vals, page * PAGE_SIZE + 1))
+
+        embed = discord.Embed(title = f"Server Leaderboard - {SORT_NAMES[sort_type]} ({PERIOD_NAMES[period]})", description = description, color = Color.random())
+        embed.set_footer(text = f"Currently controlling: {interaction.user.name} - Page {page + 1}/{page_count}", icon_url = interaction.user.avatar.url)
+
+        if page_count == 1:
+            return embed, None
+
+        # Each button holds the key of the row at its edge of this page
+        view = View(timeout = None)
+        view.add_item(ActionButton("lb-page", sort_type, page, -1, vals[0][1], vals[0][0], period, label = "<", style = discord.ButtonStyle.green))
+        view.add_item(ActionButton("lb-page", sort_type, page, 1, vals[-1][1], vals[-1][0], period, label = ">", style = discord.ButtonStyle.green))
+        return embed, view
+
+    # Page buttons, the sort type and period come from the button so only known ones are allowed.
+    # Buttons sent before periods were added have no period and page the all time leaderboard.
+    async def page_button(self, interaction: discord.Interaction, sort_type: str, page: str, step: str, value: str, user_id: str, period: str = "all"):
+        if sort_type not in SORT_NAMES:
+            raise ValueError(f"Unknown sort type: {sort_type}")
+        if period not in PERIOD_NAMES:
+            raise ValueError(f"Unknown period: {period}")
+
+        embed, view = await self.render_page(interaction, sort_type, int(page), int(step), (int(value), int(user_id)), period)
+        await interaction.response.edit_message(embed = embed, view = view)
+
     # Leaderboard Command
     @app_commands.command(name = "leaderboard", description = "View the server message leaderboard.")
     @app_commands.choices(sort_type=[
-        app_commands.Choice(name="Messages Sent", value="messageCount"),
-        app_commands.Choice(name="Words Sent", value="wordCount"),
-        app_commands.Choice(name="Attachments Sent", value="attachmentCount"),
+        app_commands.Choice(name="Messages Sent", value="messages"),
+        app_commands.Choice(name="Words Sent", value="words"),
+        app_commands.Choice(name="Attachments Sent", value="attachments"),
         ])
+    @app_commands.choices(period=[
+        app_commands.Choice(name="All Time", value="all"),
+        app_commands.Choice(name="Today", value="day"),
+        app_commands.Choice(name="This Week", value="week"),
+        app_commands.Choice(name="This Month", value="month"),
+        ])
+    @app_commands.describe(period = "Optional: the period to rank by, in UTC. Defaults to all time.")
     @app_commands.checks.cooldown(1, 10)
     @app_commands.allowed_installs(guilds=True, users=False)
     @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
-    async def leaderboard(self, interaction: discord.Interaction, sort_type: app_commands.Choice[str]):
-        await interaction.response.defer()
-        
-        pages = []
+    async def leaderboard(self, interaction: discord.Interaction, sort_type: app_commands.Choice[str], period: app_commands.Choice[str] = None):
+        responder = AdaptiveResponse(interaction, "leaderboard")
         
-        # Send initial embed
-        embed = discord.Embed(title = "Loading...")
-        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-        await interaction.followup.send(embed = embed)
+        try:
+            # Write waiting counts so the leaderboard is up to date
+            await self.counts.flush()
+
+            embed, view = await self.render_page(interaction, sort_type.value, 0, period = "all" if period == None else period.value)
+            await responder.update(embed = embed, view = view)
+        except Exception:
+            embed = discord.Embed(title = "Unexpected Error", description = "Please try again later or message <@563372552643149825> for assistance.", color = Color.red())
+            await responder.update(embed = embed, view = None)
+    
+    # Rank Command
+    @app_commands.command(name = "rank", description = "See where you or another user are on the server leaderboard.")
+    @app_commands.describe(user = "Optional: the user to look up. Defaults to you.")
+    @app_commands.checks.cooldown(1, 10)
+    @app_commands.allowed_installs(guilds=True, users=False)
+    @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
+    async def rank(self, interaction: discord.Interaction, user: discord.User = None):
+        responder = AdaptiveResponse(interaction, "rank")
+        user = user or interaction.user
 
         try:
-            i = 0
-            pageStr = ""
-            
-            if self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{str(interaction.guild.id)}';").fetchone() != None:
-                vals = self.cursor.execute(f"SELECT userMention, {sort_type.value} FROM '{interaction.guild.id}' ORDER BY {sort_type.value} DESC").fetchall()
-                if vals != []:
-                    for val in vals:
-                        i += 1
-                        
-                        if pageStr == "":
-                            pageStr += f"{i}. {val[0]}: {val[1]}"
-                        else:
-                            pageStr += f"\n{i}. {val[0]}: {val[1]}"
-
-                        # If there's 10 items in the current page, we split it into a new page
-                        if i % 10 == 0:
-                            pages.append(pageStr)
-                            pageStr = ""
-
-                    if pageStr != "":
-                        pages.append(pageStr)
-                else:
-                    pages.append("No Data")
-                
-                class Leaderboard(View):
-                    def __init__(self, pages):
-                        super().__init__()
-                        self.page = 0
-                        self.pages = pages
-                
-                    @discord.ui.button(label="<", style=discord.ButtonStyle.green, custom_id="prev")
-                    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                        if self.page > 0:
-                            self.page -= 1
-                        else:
-                            self.page = len(self.pages) - 1
-                        embed = discord.Embed(title = f"Server Leaderboard - {sort_type.name}", description = self.pages[self.page], color = Color.random())
-                        embed.set_footer(text = f"Currently controlling: {interaction.user.name} - Page {self.page + 1}/{len(self.pages)}", icon_url = interaction.user.avatar.url)
-                        await interaction.response.edit_message(embed = embed)
-
-                    @discord.ui.button(label=">", style=discord.ButtonStyle.green, custom_id="next")
-                    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                        if self.page < len(self.pages) - 1:
-                            self.page += 1
-                        else:
-                            self.page = 0
-                        embed = discord.Embed(title = f"Server Leaderboard - {sort_type.name}", description = self.pages[self.page], color = Color.red())
-                        embed.set_footer(text = f"Currently controlling: {interaction.user.name} - Page {self.page + 1}/{len(self.pages)}", icon_url = interaction.user.avatar.url)
-                        await interaction.response.edit_message(embed = embed)
-
-                embed = discord.Embed(title = f"Server Leaderboard - {sort_type.name}", description=pages[0], color = Color.random())
-                embed.set_footer(text = f"Currently controlling: {interaction.user.name} - Page 1/{len(pages)}", icon_url = interaction.user.avatar.url)
-                
-                if len(pages) == 1:
-                    await interaction.edit_original_response(embed = embed)
-                else:
-                    await interaction.edit_original_response(embed = embed, view = Leaderboard(pages))
-            else:
+            if not self.is_enabled(interaction.guild.id):
                 embed = discord.Embed(title = "Not Enabled", description = "The message leaderboard is not enabled in this server.", color = Color.red())
-                await interaction.edit_original_response(embed = embed)
+                await responder.update(embed = embed)
+                return
+
+            # Write waiting counts so the rank is up to date
+            await self.counts.flush()
+
+            indexes = await self.get_rank_indexes(interaction.guild.id)
+            neighbours = await self.store.neighbours(interaction.guild.id, user.id)
+
+            if neighbours == None:
+                embed = discord.Embed(title = "Not Ranked", description = f"{user.mention} isn't on the leaderboard yet.", color = Color.red())
+                await responder.update(embed = embed)
+                return
+
+            embed = discord.Embed(title = "Leaderboard Rank", description = f"Ranks for {user.mention}, users with the same value share a rank.", color = Color.random())
+            embed.set_author(name = user.name, icon_url = user.avatar.url)
+
+            for column, (value, above, below) in neighbours.items():
+                lines = [f"**#{indexes[column].count_above(value) + 1}** of {len(indexes[column])} - {value}"]
+                if above != None:
+                    lines.append(f"Above: <@{above[0]}> ({above[1]})")
+                if below != None:
+                    lines.append(f"Below: <@{below[0]}> ({below[1]})")
+
+                embed.add_field(name = SORT_NAMES[column], value = "\n".join(lines), inline = False)
+
+            embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
+            await responder.update(embed = embed)
         except Exception:
             embed = discord.Embed(title = "Unexpected Error", description = "Please try again later or message <@563372552643149825> for assistance.", color = Color.red())
-            await interaction.edit_original_response(embed = embed, view = None)
-    
+            await responder.update(embed = embed, view = None)
+
     context = discord.app_commands.AppCommandContext(guild=True, dm_channel=False, private_channel=False)
     installs = discord.app_commands.AppInstallationType(guild=True, user=False)
     lbGroup = app_commands.Group(name="lb-control", description="Control the leaderboard.", allowed_contexts=context, allowed_installs=installs)
@@ -157,12 +327,12 @@ class leaderboard(commands.Cog):
         await interaction.edit_original_response(embed = embed)
 
         try:
-            if self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{str(interaction.guild.id)}';").fetchone() != None:
+            if self.is_enabled(interaction.guild.id):
                 embed = discord.Embed(title = "Success", description = "Already enabled for this server.", color = Color.green())
                 await interaction.edit_original_response(embed = embed)
             else:
-                self.cursor.execute(f"CREATE TABLE '{interaction.guild.id}' (userMention text, messageCount integer, wordCount integer, attachmentCount integer)")
-                self.connection.commit()
+                await self.store.enable(interaction.guild.id)
+                self.enabled_guilds.add(interaction.guild.id)
                 
                 embed = discord.Embed(title = "Success", description = "Enabled message leaderboard for this server.", color = Color.green())
                 await interaction.edit_original_response(embed = embed)
@@ -183,12 +353,22 @@ class leaderboard(commands.Cog):
             await interaction.edit_original_response(embed = embed, view = None)
 
             try:
-                if self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{interaction.guild.id}';").fetchone() == None:
+                if not self.is_enabled(interaction.guild.id):
                     embed = discord.Embed(title = "Failed", description = "Leaderboard is already disabled in this server.", color = Color.red())
                     await interaction.edit_original_response(embed = embed)
                 else:
-                    self.cursor.execute(f"DROP TABLE '{interaction.guild.id}'")
-                    self.connection.commit()
+                    # Stop counting first, so batches written from here on skip this server. The
+                    # flush waits for a batch that's already being written, before deleting.
+                    self.enabled_guilds.discard(interaction.guild.id)
+
+                    try:
+                        await self.counts.flush()
+                        await self.store.disable(interaction.guild.id)
+                    except Exception:
+                        self.enabled_guilds.add(interaction.guild.id)
+                        raise
+
+                    self.forget_guild(interaction.guild.id)
 
                     embed = discord.Embed(title = "Disabled.", color = Color.green())
                     await interaction.edit_original_response(embed = embed)
@@ -292,7 +472,7 @@ class leaderboard(commands.Cog):
         embed = discord.Embed(title = "Loading...", color = Color.orange())
         await interaction.followup.send(embed = embed, ephemeral = True)
         
-        if self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{interaction.guild.id}';").fetchone() == None:
+        if not self.is_enabled(interaction.guild.id):
             embed = discord.Embed(title = "Disabled", description = "Leaderboard is disabled in this server.", color = Color.red())
             await interaction.edit_original_response(embed = embed)
         else:
@@ -303,8 +483,11 @@ class leaderboard(commands.Cog):
                 await interaction.edit_original_response(embed = embed, view = None)
 
                 try:
-                    self.cursor.execute(f"DELETE FROM '{interaction.guild.id}';")
-                    self.connection.commit()
+                    # Write waiting counts first, so they are removed too
+                    await self.counts.flush()
+
+                    await self.store.reset(interaction.guild.id)
+                    self.forget_guild(interaction.guild.id)
 
                     embed = discord.Embed(title = "Reset.", color = Color.green())
                     await interaction.edit_original_response(embed = embed)
@@ -329,7 +512,7 @@ class leaderboard(commands.Cog):
         embed = discord.Embed(title = "Loading...", color = Color.orange())
         await interaction.followup.send(embed = embed, ephemeral = True)
         
-        if self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{interaction.guild.id}';").fetchone() == None:
+        if not self.is_enabled(interaction.guild.id):
             embed = discord.Embed(title = "Disabled", description = "Leaderboard is disabled in this server.", color = Color.red())
             await interaction.edit_original_response(embed = embed)
         else:
@@ -340,8 +523,11 @@ class leaderboard(commands.Cog):
                 await interaction.edit_original_response(embed = embed, view = None)
 
                 try:
-                    self.cursor.execute(f"DELETE FROM '{interaction.guild.id}' WHERE userMention = '{user.mention}';")
-                    self.connection.commit()
+                    # Write waiting counts first, so they are removed too
+                    await self.counts.flush()
+
+                    await self.store.reset_user(interaction.guild.id, user.id)
+                    self.forget_guild(interaction.guild.id)
 
                     embed = discord.Embed(title = "Removed.", color = Color.green())
                     await interaction.edit_original_response(embed = embed)
@@ -364,7 +550,7 @@ class leaderboard(commands.Cog):
 
         title = "Leaderboard Privacy Disclaimer"
         description = "The leaderboard system tracks the following information:"
-        description += "\n\n-User Mention\n-Message Count\n-Word Count\n-Attachment Count\n-Server ID"
+        description += "\n\n-User ID\n-Message Count\n-Word Count\n-Attachment Count\n-Server ID"
         description += "Message content is temporarily stored while word count is processed. "
         description += "A list of attachments in the target message is also temporarily stored, so we can work out how many attachments are in your message. "
         description += "Message content and attachment data can not be viewed at any point during the tracking process, and is not saved after it has been processed."
@@ -1,13 +1,71 @@
 import discord
-from discord import app_commands, Color, ButtonStyle
+from discord import app_commands, Color
 from discord.ext import commands
 from discord.ui import Select, View
 import aiohttp
 from urllib.parse import quote
 
+from lib.cache import TTLCache
+from lib.pages import paginate_text
+from lib.responses import AdaptiveResponse
+from lib.views import add_page_buttons, pager, register, unregister
+
+# How long song lyrics from searches are kept for the page buttons
+LYRICS_TTL = 60 * 60
+
 class music(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.button_handlers = {"lyrics-page": pager(self.render_lyrics)}
+
+        # lrclib ID -> (song, artist, lyrics)
+        self.lyrics_cache = TTLCache("lyrics", maxsize = 256)
+
+    async def cog_load(self):
+        register(self.bot, self.button_handlers)
+
+    async def cog_unload(self):
+        unregister(self.bot, self.button_handlers)
+
+    # Get a song's name, artist and lyrics by lrclib ID
+    async def get_song(self, song_id):
+        song = self.lyrics_cache.get(int(song_id))
+
+        if song == None:
+            async with self.bot.session.get(f"https://lrclib.net/api/get/{int(song_id)}") as request:
+                request.raise_for_status()
+                request_data = await request.json()
+
+            song = (request_data['trackName'], request_data['artistName'], request_data['plainLyrics'])
+            self.lyrics_cache.set(int(song_id), song, LYRICS_TTL)
+
+        return song
+
+    # Render a page of a song's lyrics, pages out of range wrap around
+    async def render_lyrics(self, interaction: discord.Interaction, song_id, longer, page: int):
+        name, artist, lyrics = await self.get_song(song_id)
+        longer = longer in (True, "True")
+
+        google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(name)).replace("%2B", "+")}+{(quote(artist)).replace("%2B", "+")}')
+        view = View(timeout = None)
+        view.add_item(google_button)
+
+        try:
+            paged_lyrics = paginate_text(lyrics, "\n\n", 4096 if longer else 1600)
+        except AttributeError:
+            embed = discord.Embed(title = f"{name} - {artist}", description = "The song has no lyrics.", color = Color.red())
+            return embed, view
+
+        page %= len(paged_lyrics)
+
+        # Create lyric embed
+        embed = discord.Embed(title = f"Lyrics: {name} - {artist}", description = paged_lyrics[page], color = Color.random())
+        embed.set_footer(text = f"lrclib.net - Page {page + 1}/{len(paged_lyrics)}")
+
+        if len(paged_lyrics) > 1:
+            add_page_buttons(view, "lyrics-page", song_id, longer, page = page)
+
+        return embed, view
 
     # Lyrics command
     @app_commands.command(name = "lyrics", description = "Find Lyrics to a song.")
@@ -18,7 +76,7 @@ class music(commands.Cog):
     @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
     async def lyrics(self, interaction: discord.Interaction, search: str, longer_pages: bool = False):
         try:    
-            await interaction.response.defer()
+            responder = AdaptiveResponse(interaction, "lyrics")
 
             # Define lists
             options = []
@@ -26,17 +84,11 @@ class music(commands.Cog):
             artist_list = []
             album_list = []
             id_list = []
-            lyrics_list = []
 
             # Clean up user input
             search = search.replace(" ", "%20")
             search = search.lower()
 
-            # Send initial embed
-            embed = discord.Embed(title = "Searching...", color = Color.orange())
-            embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-            await interaction.followup.send(embed = embed)
-
             # Create URL
             request_url = f"https://lrclib.net/api/search?q={search}"
 
@@ -51,7 +103,7 @@ class music(commands.Cog):
             # Check if result is blank
             if request_data == []:
                 embed = discord.Embed(title = "Error", description="No results were found.", color = Color.red())
-                await interaction.edit_original_response(embed = embed)
+                await responder.update(embed = embed)
             else:
                 # Sort through request data, add required info to lists
                 for song in request_data:
@@ -59,7 +111,7 @@ class music(commands.Cog):
                     artist_list.append(song['artistName'])
                     album_list.append(song['albumName'])
                     id_list.append(song['id'])
-                    lyrics_list.append(song['plainLyrics'])
+                    self.lyrics_cache.set(song['id'], (song['name'], song['artistName'], song['plainLyrics']), LYRICS_TTL)
 
                 # Generate dropdown values
                 if len(song_list) > 5:
@@ -97,79 +149,8 @@ class music(commands.Cog):
                 # Response to user selection
                 async def response(interaction: discord.Interaction):
                     await interaction.response.defer()
-                    # Find unique ID of selection in the list
-                    list_place = id_list.index(int(select.values[0]))
-                    
-                    try:
-                        lyrics_split = lyrics_list[list_place].split("\n\n")
-
-                        paged_lyrics = []
-                        current_page = ""
-
-                        for paragraph in lyrics_split:
-                            if longer_pages == True:
-                                if len(paragraph) + len(current_page) < 4096:
-                                    current_page = current_page + "\n\n" + paragraph
-                                else:
-                                    paged_lyrics.append(current_page)
-                                    current_page = ""
-                                    current_page = current_page + paragraph
-                            else:
-                                if len(paragraph) + len(current_page) < 1600:
-                                    current_page = current_page + "\n\n" + paragraph
-                                else:
-                                    paged_lyrics.append(current_page)
-                                    current_page = ""
-                                    current_page = current_page + paragraph
-
-                        paged_lyrics.append(current_page)
-
-                        # Create lyric embed
-                        embed = discord.Embed(title = f"Lyrics: {song_list[list_place]} - {artist_list[list_place]}", description = paged_lyrics[0], color = Color.random())
-                        
-                        class PaginationView(View):
-                            def __init__(self, pages):
-                                super().__init__(timeout = 3600)
-                                self.page = 0
-                                self.pages = pages
-                                google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={song_list[list_place].replace(" ", "+")}+{artist_list[list_place].replace(" ", "+")}')
-                                self.add_item(google_button)
-                        
-                            @discord.ui.button(label="<", style=ButtonStyle.green, custom_id="prev")
-                            async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                                if self.page > 0:
-                                    self.page -= 1
-                                else:
-                                    self.page = len(self.pages) - 1
-                                embed = discord.Embed(title = f"Lyrics: {song_list[list_place]} - {artist_list[list_place]}", description = self.pages[self.page], color = Color.random())
-                                embed.set_footer(text = f"lrclib.net - Page {self.page + 1}/{len(paged_lyrics)}")
-                                await interaction.response.edit_message(embed = embed)
-
-                            @discord.ui.button(label=">", style=ButtonStyle.green, custom_id="next")
-                            async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                                if self.page < len(self.pages) - 1:
-                                    self.page += 1
-                                else:
-                                    self.page = 0
-                                embed = discord.Embed(title = f"Lyrics: {song_list[list_place]} - {artist_list[list_place]}", description = self.pages[self.page], color = Color.random())
-                                embed.set_footer(text = f"lrclib.net - Page {self.page + 1}/{len(paged_lyrics)}")
-                                await interaction.response.edit_message(embed = embed)
-
-                        if len(paged_lyrics) == 1:
-                            google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(song_list[list_place])).replace("%2B", "+")}+{(quote(artist_list[list_place])).replace("%2B", "+")}')
-                            view = View()
-                            view.add_item(google_button)
-                            embed.set_footer(text = f"lrclib.net - Page 1/1")
-                            await interaction.edit_original_response(embed = embed, view = view)
-                        else:
-                            embed.set_footer(text = f"lrclib.net - Page 1/{len(paged_lyrics)}")
-                            await interaction.edit_original_response(embed = embed, view = PaginationView(paged_lyrics))
-                    except AttributeError:
-                        google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(song_list[list_place])).replace("%2B", "+")}+{(quote(artist_list[list_place])).replace("%2B", "+")}')
-                        view = View()
-                        view.add_item(google_button)
-                        embed = discord.Embed(title = f"{song_list[list_place]} - {artist_list[list_place]}", description = "The song has no lyrics.", color = Color.red())
-                        await interaction.edit_original_response(embed = embed, view = view)
+                    embed, view = await self.render_lyrics(interaction, select.values[0], longer_pages, 0)
+                    await interaction.edit_original_response(embed = embed, view = view)
                 
                 # Set up list with provided values
                 select.callback = response
@@ -177,12 +158,12 @@ class music(commands.Cog):
                 view.add_item(select)
 
                 # Edit initial message to show dropdown
-                await interaction.edit_original_response(embed = embed, view = view)
+                await responder.update(embed = embed, view = view)
         except Exception as error:
             embed = discord.Embed(title = "Lyrics - Error", description = "An unknown error has occurred. The error has been logged.")
             print("[LYRICS] Error has occurred. Error below:")
             print(error)
-            await interaction.edit_original_response(embed = embed, view = None, ephemeral = True)
+            await responder.update(embed = embed, view = None)
 
 async def setup(bot):
     await bot.add_cog(music(bot))
\ No newline at end of file
@@ -2,20 +2,88 @@ import discord
 from discord import app_commands, Color
 from discord.ext import commands
 from discord.ui import View, Select
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
 from urllib.parse import quote
-import random
-import aiohttp
-import string
-from colorthief import ColorThief
-import os
+
+from lib.colors import color_image
+from lib.responses import AdaptiveResponse
+from lib.spotify import SpotifyError
+from lib.spotify_embeds import album_embed, album_option, art_embed, artist_embed, artist_names, artist_option, duration, send_with_color, track_embed, track_option
+from lib.views import ActionButton, dismiss_button, register, unregister
 
 class spotify(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.auth_manager = SpotifyClientCredentials(client_id = self.bot.spotify_id, client_secret = self.bot.spotify_secret)
-        self.sp = spotipy.Spotify(auth_manager=self.auth_manager)
+        self.button_handlers = {"spotify-more": self.more_button, "spotify-art": self.art_button}
+
+    async def cog_load(self):
+        register(self.bot, self.button_handlers)
+
+    async def cog_unload(self):
+        unregister(self.bot, self.button_handlers)
+
+    # More button, sends links and the album art button for a song, artist or album
+    async def more_button(self, interaction: discord.Interaction, item_type: str, item_id: str):
+        await interaction.response.defer()
+
+        if item_type == "track":
+            item = await self.bot.spotify.track(item_id)
+        elif item_type == "album":
+            item = await self.bot.spotify.album(item_id)
+        else:
+            item = await self.bot.spotify.artist(item_id)
+
+        view = View(timeout = None)
+
+        if item_type == "artist":
+            # Add Search on Google button
+            google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(item.name)).replace("%2B", "+")}', row = 1)
+            view.add_item(google_button)
+
+            # Add Close button
+            view.add_item(dismiss_button(row = 1))
+        else:
+            artist_string = artist_names(item.artists)
+
+            # Add song.link button
+            songlink_button = discord.ui.Button(label="Other Streaming Services", style=discord.ButtonStyle.url, url=f"https://song.link/{item.url}", row = 1)
+            view.add_item(songlink_button)
+
+            # Add Search on Google button
+            google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(item.name)).replace("%2B", "+")}+{(quote(artist_string)).replace("%2B", "+")}', row = 1)
+            view.add_item(google_button)
+
+            # Add Album Art and Close buttons
+            view.add_item(ActionButton("spotify-art", item_type, item_id, label = "Album Art", row = 2))
+            view.add_item(dismiss_button(row = 2))
+
+        await interaction.followup.send(view = view)
+
+    # Album Art button for a song or album
+    async def art_button(self, interaction: discord.Interaction, item_type: str, item_id: str):
+        await interaction.response.defer()
+
+        embed = discord.Embed(title = "Getting images...", color = Color.orange())
+        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
+        await interaction.edit_original_response(embed = embed, view = None)
+
+        if item_type == "track":
+            item = await self.bot.spotify.track(item_id)
+            images = item.album.images
+        else:
+            item = await self.bot.spotify.album(item_id)
+            images = item.images
+
+        if images:
+            image_url = color_image(images).url
+
+            embed = art_embed(f"{item.name} ({artist_names(item.artists)}) - Album Art", images[0])
+
+            # Sent once the colour is ready, or first in the placeholder colour if it takes a while
+            await send_with_color(self.bot.colors, embed, image_url, lambda embed: interaction.edit_original_response(embed = embed), f"Requested by {interaction.user.name}", interaction.user.avatar.url)
+        else:
+            embed = discord.Embed(title = "No album art available.", color = Color.red())
+            embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
+            await interaction.edit_original_response(embed = embed)
 
     context = discord.app_commands.AppCommandContext(guild=True, dm_channel=True, private_channel=True)
     installs = discord.app_commands.AppInstallationType(guild=True, user=True)
@@ -33,59 +101,22 @@ class spotify(commands.Cog):
     @app_commands.describe(search = "What you are searching for.")
     @app_commands.describe(compact = "Optional: whether to display song embed in a more compact format. Defaults to false.")
     async def spotify_search(self, interaction: discord.Interaction, search_type: app_commands.Choice[str], search: str, compact: bool = False):
-        await interaction.response.defer()
-
-        options_list = []
-        
-        # Send initial embed
-        embed = discord.Embed(title = "Please wait...", color = Color.orange())
-        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-        await interaction.followup.send(embed = embed)
+        responder = AdaptiveResponse(interaction, "spotify-search")
 
         try:
             if search_type.value == "song":
                 # Search Spotify
-                result = self.sp.search(search, type = 'track', limit = 5)
+                result = await self.bot.spotify.search(search, type = 'track', limit = 5)
 
                 # Check if result is blank
-                if len(result['tracks']['items']) == 0:
+                if len(result) == 0:
                     embed = discord.Embed(title = "Error", description="No results were found.", color = Color.red())
-                    await interaction.edit_original_response(embed = embed)
+                    await responder.update(embed = embed)
                 else:
-                    # Sort through request data
-                    i = 0
-                    for item in result['tracks']['items']:   
-                        if item['explicit'] == True:
-                            if len(item['name']) > 86:
-                                label = item['name'][:86] + "... (Explicit)"
-                            else:
-                                label = item['name'] + " (Explicit)"
-                        else:
-                            if len(item['name']) > 100:
-                                label = item['name'][:97] + "..."
-                            else:
-                                label = item['name']
-                        
-                        artist_string = ""
-                        
-                        for artist in item['artists']:
-                            if artist_string == "":
-                                artist_string = artist['name']
-                            else:
-                                artist_string += f", {artist['name']}"
-                        
-                        if len(f"{artist_string} - {item['album']['name']}") > 100:
-                            description = f"{artist_string} - {item['album']['name']}"[:97] + "..."
-                        else:
-                            description = f"{artist_string} - {item['album']['name']}"
-                        
-                        options_list.append(discord.SelectOption(label = label, description = description, value = i))
-                        i += 1
-                    
                     # Define options
-                    select = Select(options = options_list)
+                    select = Select(options = [track_option(i, item) for i, item in enumerate(result)])
 
-                    embed = discord.Embed(title = "Select Song", description = f'Showing {len(result["tracks"]["items"])} results for "{search}"', color = Color.random())
+                    embed = discord.Embed(title = "Select Song", description = f'Showing {len(result)} results for "{search}"', color = Color.random())
                     embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
 
                     # Response to user selection
@@ -93,153 +124,25 @@ class spotify(commands.Cog):
                         await interaction.response.defer()
                         
                         # Find unique ID of selection in the list
-                        item = result['tracks']['items'][int(select.values[0])]
+                        item = result[int(select.values[0])]
                         
-                        image_url = item['album']['images'][0]['url']
-                        
-                        embed = discord.Embed(title = "Please wait...", color = Color.orange())
-                        await interaction.edit_original_response(embed = embed, view = None)
-                        
-                        artist_string = ""
-                        for artist in item['artists']:
-                            if artist_string == "":
-                                artist_string = artist['name']
-                            else:
-                                artist_string += f", {artist['name']}"
+                        image_url = color_image(item.album.images).url
                         
                         # Set up new embed
-                        if item['explicit'] == True:
-                            embed = discord.Embed(title = f"{item['name']} (Explicit)", color = Color.from_rgb(r = 255, g = 255, b = 255))
-                        else:
-                            embed = discord.Embed(title = item['name'], color = Color.from_rgb(r = 255, g = 255, b = 255))
-                        embed.set_thumbnail(url = item['album']['images'][0]['url'])
-                        embed.add_field(name = "Artists", value = artist_string, inline = compact)
-                        embed.add_field(name = "Album", value = item['album']['name'], inline = compact)
-                        embed.set_footer(text = "Getting colour information...")
-                        
+                        embed = track_embed(item, inline = compact)
+
                         # Define View
-                        view = View(timeout=1800)
-                        
-                        seconds, item['duration_ms'] = divmod(item['duration_ms'], 1000)
-                        minutes, seconds = divmod(seconds, 60)
+                        view = View(timeout = None)
 
                         # Add Open in Spotify button
-                        spotify_button = discord.ui.Button(label=f'Play on Spotify ({int(minutes):02d}:{int(seconds):02d})', style=discord.ButtonStyle.url, url=item['external_urls']['spotify'], row = 0)
+                        spotify_button = discord.ui.Button(label=f'Play on Spotify ({duration(item.duration_ms)})', style=discord.ButtonStyle.url, url=item.url, row = 0)
                         view.add_item(spotify_button)
 
-                        # More Button Callback
-                        async def more_callback(interaction: discord.Interaction):
-                            await interaction.response.defer()
-
-                            view = View(timeout=300)
-
-                            # Add song.link button                
-                            songlink_button = discord.ui.Button(label="Other Streaming Services", style=discord.ButtonStyle.url, url=f"https://song.link/{item['external_urls']['spotify']}", row = 1)
-                            view.add_item(songlink_button)
-
-                            # Add Search on Google button
-                            google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(item["name"])).replace("%2B", "+")}+{(quote(artist_string)).replace("%2B", "+")}', row = 1)
-                            view.add_item(google_button)
-
-                            # Album Art Callback
-                            async def art_callback(interaction: discord.Interaction):
-                                await interaction.response.defer()
-                                
-                                embed = discord.Embed(title = "Getting images...", color = Color.orange())
-                                embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                await interaction.edit_original_response(embed = embed, view = None)
-                                
-                                if item["album"]["images"] != None:
-                                    image_url = item["album"]["images"][0]["url"]
-
-                                    if item["album"]["images"][0]['height'] == None or item["album"]["images"][0]['width'] == None:
-                                        embed = discord.Embed(title = f"{item['name']} ({artist_string}) - Album Art", description = "Viewing highest quality (Resolution unknown)", color = Color.from_rgb(r = 255, g = 255, b = 255))
-                                        embed.set_footer(text = "Getting colour information...")
-                                    else:
-                                        embed = discord.Embed(title = f"{item['name']} ({artist_string}) - Album Art", description = f"Viewing highest quality ({item['album']['images'][0]['width']}x{item['album']['images'][0]['height']})", color = Color.from_rgb(r = 255, g = 255, b = 255))
-                                        embed.set_footer(text = "Getting colour information...")
-                                    
-                                    embed.set_image(url = item["album"]["images"][0]["url"])
-                                    await interaction.edit_original_response(embed = embed)
-
-                                    letters = string.ascii_lowercase
-                                    filename = ''.join(random.choice(letters) for i in range(8))
-
-                                    async with aiohttp.ClientSession() as session:
-                                        async with session.get(image_url) as request:
-                                            file = open(f'{filename}.jpg', 'wb')
-                                            async for chunk in request.content.iter_chunked(10):
-                                                file.write(chunk)
-                                            file.close()
-                                            
-                                    color_thief = ColorThief(f'{filename}.jpg')
-                                    dominant_color = color_thief.get_color(quality=1)
-
-                                    os.remove(f'{filename}.jpg')
-
-                                    if item["album"]["images"][0]['height'] == None or item["album"]["images"][0]['width'] == None:
-                                        embed = discord.Embed(title = f"{item['name']} ({artist_string}) - Album Art", description = "Viewing highest quality (Resolution unknown)", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                    else:
-                                        embed = discord.Embed(title = f"{item['name']} ({artist_string}) - Album Art", description = f"Viewing highest quality ({item['album']['images'][0]['width']}x{item['album']['images'][0]['height']})", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                    
-                                    embed.set_image(url = item["album"]["images"][0]["url"])
-                                    await interaction.edit_original_response(embed = embed)
-                                else:
-                                    embed = discord.Embed(title = "No album art available.", color = Color.red())
-                                    embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                    await interaction.edit_original_response(embed = embed)
-                            
-                            # Add Album Art button
-                            art_button = discord.ui.Button(label='Album Art', style=discord.ButtonStyle.gray, row = 2)
-                            art_button.callback = art_callback
-                            view.add_item(art_button)
-
-                            # Close Button Callback
-                            async def delete_callback(interaction: discord.Interaction):
-                                await interaction.response.defer()
-                                
-                                await msg.delete()
-                            
-                            # Add Close button
-                            close_button = discord.ui.Button(label='Close', style = discord.ButtonStyle.red, row = 2)
-                            close_button.callback = delete_callback
-                            view.add_item(close_button)
-
-                            msg = await interaction.followup.send(view = view)
-                        
                         # Add More Options button
-                        more_button = discord.ui.Button(label=f'More', style=discord.ButtonStyle.gray, row = 0)
-                        more_button.callback = more_callback
-                        view.add_item(more_button)
-
-                        # Send new embed
-                        await interaction.edit_original_response(embed = embed, view = view)
-
-                        # Generate random filename
-                        letters = string.ascii_lowercase
-                        filename = ''.join(random.choice(letters) for i in range(8))
-
-                        # Save image
-                        async with aiohttp.ClientSession() as session:
-                            async with session.get(image_url) as request:
-                                file = open(f'{filename}.jpg', 'wb')
-                                async for chunk in request.content.iter_chunked(10):
-                                    file.write(chunk)
-                                file.close()
-                                
-                        # Get dominant colour for embed
-                        color_thief = ColorThief(f'{filename}.jpg')
-                        dominant_color = color_thief.get_color(quality=1)
-
-                        # Remove file when done
-                        os.remove(f'{filename}.jpg')
-
-                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                        embed.color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2])
-
-                        await interaction.edit_original_response(embed = embed)
+                        view.add_item(ActionButton("spotify-more", "track", item.id, label = "More", row = 0))
+
+                        # Sent once the colour is ready, or first in the placeholder colour if it takes a while
+                        await send_with_color(self.bot.colors, embed, image_url, lambda embed: interaction.edit_original_response(embed = embed, view = view), f"Requested by {interaction.user.name}", interaction.user.avatar.url)
                     
                     # Set up list with provided values
                     select.callback = response
@@ -247,130 +150,47 @@ class spotify(commands.Cog):
                     view.add_item(select)
 
                     # Edit initial message to show dropdown
-                    await interaction.edit_original_response(embed = embed, view = view)
+                    await responder.update(embed = embed, view = view)
             elif search_type.value == "artist":
                 # Search Spotify
-                result = self.sp.search(search, type = 'artist', limit = 5)
+                result = await self.bot.spotify.search(search, type = 'artist', limit = 5)
 
                 # Check if result is blank
-                if len(result['artists']['items']) == 0:
+                if len(result) == 0:
                     embed = discord.Embed(title = "Error", description="No results were found.", color = Color.red())
-                    await interaction.edit_original_response(embed = embed)
+                    await responder.update(embed = embed)
                 else:
-                    # Sort through request data
-                    i = 0
-                    for item in result['artists']['items']:
-                        options_list.append(discord.SelectOption(label = item['name'], value = i))
-                        i += 1
-                    
                     # Define options
-                    select = Select(options=options_list)
+                    select = Select(options = [artist_option(i, item) for i, item in enumerate(result)])
 
-                    embed = discord.Embed(title = "Select Artist", description = f'Showing {len(result["artists"]["items"])} results for "{search}"', color = Color.random())
+                    embed = discord.Embed(title = "Select Artist", description = f'Showing {len(result)} results for "{search}"', color = Color.random())
                     embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
 
                     # Response to user selection
                     async def response(interaction: discord.Interaction):
                         await interaction.response.defer()
                         
-                        embed = discord.Embed(title = "Please wait...", color = Color.orange())
-                        await interaction.edit_original_response(embed = embed, view = None)
-                        
-                        item = result['artists']['items'][int(select.values[0])]
+                        item = result[int(select.values[0])]
 
-                        result_info = self.sp.artist(item['id'])
+                        result_info = await self.bot.spotify.artist(item.id)
 
-                        result_top_tracks = self.sp.artist_top_tracks(item['id'])
+                        result_top_tracks = await self.bot.spotify.artist_top_tracks(item.id)
                         
-                        image_url = result_info["images"][0]["url"]
+                        image_url = color_image(result_info.images).url
                         
-                        embed = discord.Embed(title = f"{result_info['name']}", color = Color.from_rgb(r = 255, g = 255, b = 255))
-                        embed.add_field(name = "Followers", value = f"{result_info['followers']['total']:,}")
-                        embed.set_thumbnail(url = result_info["images"][0]["url"])
-                        embed.set_footer(text = "Getting colour information...")
-
-                        topsong_string = ""
-                        for i in range(0,5):
-                            artist_string = ""
-                            for artist in result_top_tracks['tracks'][i]['artists']:
-                                if artist_string == "":
-                                    artist_string = artist['name'].replace('*', '-') 
-                                else:
-                                    artist_string += f", {artist['name']}".replace('*', '-')
-                                    
-                            # Hide artist string from song listing if there is only one artist
-                            if len(result_top_tracks['tracks'][i]['artists']) == 1:
-                                if topsong_string == "":
-                                    topsong_string = f"{i + 1}. **{result_top_tracks['tracks'][i]['name'].replace('*', '-')}**"
-                                else:
-                                    topsong_string += f"\n{i + 1}. **{result_top_tracks['tracks'][i]['name'].replace('*', '-')}**"
-                            else:
-                                if topsong_string == "":
-                                    topsong_string = f"{i + 1}. **{result_top_tracks['tracks'][i]['name'].replace('*', '-')}** - {artist_string}"
-                                else:
-                                    topsong_string += f"\n{i + 1}. **{result_top_tracks['tracks'][i]['name'].replace('*', '-')}** - {artist_string}"
-                        
-                        embed.add_field(name = "Top Songs", value = topsong_string, inline = False)
+                        embed = artist_embed(result_info, result_top_tracks)
 
-                        view = View(timeout=1800)
+                        view = View(timeout = None)
                         
                         # Add Open in Spotify button
-                        spotify_button = discord.ui.Button(label=f'Show on Spotify', style=discord.ButtonStyle.url, url=result_info['external_urls']['spotify'], row = 0)
+                        spotify_button = discord.ui.Button(label=f'Show on Spotify', style=discord.ButtonStyle.url, url=result_info.url, row = 0)
                         view.add_item(spotify_button)
 
-                        # More Button Callback
-                        async def more_callback(interaction: discord.Interaction):
-                            await interaction.response.defer()
-
-                            view = View(timeout=300)
-
-                            # Add Search on Google button
-                            google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(item["name"])).replace("%2B", "+")}', row = 1)
-                            view.add_item(google_button)
-
-                            # Close Button Callback
-                            async def delete_callback(interaction: discord.Interaction):
-                                await interaction.response.defer()
-                                
-                                await msg.delete()
-                            
-                            # Add Close button
-                            close_button = discord.ui.Button(label='Close', style = discord.ButtonStyle.red, row = 1)
-                            close_button.callback = delete_callback
-                            view.add_item(close_button)
-
-                            msg = await interaction.followup.send(view = view)
-                        
                         # Add More Options button
-                        more_button = discord.ui.Button(label=f'More', style=discord.ButtonStyle.gray, row = 0)
-                        more_button.callback = more_callback
-                        view.add_item(more_button)
-
-                        await interaction.edit_original_response(embed = embed, view = view)
-
-                        # Generate random filename
-                        letters = string.ascii_lowercase
-                        filename = ''.join(random.choice(letters) for i in range(8))
-
-                        # Save image
-                        async with aiohttp.ClientSession() as session:
-                            async with session.get(image_url) as request:
-                                file = open(f'{filename}.jpg', 'wb')
-                                async for chunk in request.content.iter_chunked(10):
-                                    file.write(chunk)
-                                file.close()
-                                
-                        # Get dominant colour for embed
-                        color_thief = ColorThief(f'{filename}.jpg')
-                        dominant_color = color_thief.get_color(quality=1)
-
-                        # Remove file when done
-                        os.remove(f'{filename}.jpg')
-
-                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                        embed.color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2])
-
-                        await interaction.edit_original_response(embed = embed)
+                        view.add_item(ActionButton("spotify-more", "artist", result_info.id, label = "More", row = 0))
+
+                        # Sent once the colour is ready, or first in the placeholder colour if it takes a while
+                        await send_with_color(self.bot.colors, embed, image_url, lambda embed: interaction.edit_original_response(embed = embed, view = view), f"Requested by {interaction.user.name}", interaction.user.avatar.url)
                     
                     # Set up list with provided values
                     select.callback = response
@@ -378,200 +198,45 @@ class spotify(commands.Cog):
                     view.add_item(select)
 
                     # Edit initial message to show dropdown
-                    await interaction.edit_original_response(embed = embed, view = view)
+                    await responder.update(embed = embed, view = view)
             elif search_type.value == "album":
                 # Search Spotify
-                result = self.sp.search(search, type = 'album', limit = 5)
+                result = await self.bot.spotify.search(search, type = 'album', limit = 5)
 
                 # Check if result is blank
-                if len(result['albums']['items']) == 0:
+                if len(result) == 0:
                     embed = discord.Embed(title = "Error", description="No results were found.", color = Color.red())
-                    await interaction.edit_original_response(embed = embed)
+                    await responder.update(embed = embed)
                 else:
-                    # Sort through request data
-                    i = 0
-                    for item in result['albums']['items']:
-                        artist_string = ""
-                        for artist in item['artists']:
-                            if artist_string == "":
-                                artist_string = artist['name'].replace('*', '-') 
-                            else:
-                                artist_string += f", {artist['name']}".replace('*', '-')
-                        
-                        options_list.append(discord.SelectOption(label = item['name'], description = artist_string, value = i))
-                        i += 1
-                    
                     # Define options
-                    select = Select(options=options_list)
+                    select = Select(options = [album_option(i, item) for i, item in enumerate(result)])
 
-                    embed = discord.Embed(title = "Select Album", description = f'Showing {len(result["albums"]["items"])} results for "{search}"', color = Color.random())
+                    embed = discord.Embed(title = "Select Album", description = f'Showing {len(result)} results for "{search}"', color = Color.random())
                     embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
 
                     # Response to user selection
                     async def response(interaction: discord.Interaction):
                         await interaction.response.defer()
                         
-                        embed = discord.Embed(title = "Please wait...", color = Color.orange())
-                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                        await interaction.edit_original_response(embed = embed, view = None)
-                        
-                        item = result['albums']['items'][int(select.values[0])]
+                        item = result[int(select.values[0])]
 
-                        result_info = self.sp.album(item['id'])
-                        
-                        image_url = result_info["images"][0]["url"]
+                        result_info = await self.bot.spotify.album(item.id)
                         
-                        songlist_string = ""
-                        for i in range(len(result_info['tracks']['items'])):
-                            artist_string = ""
-                            for artist in result_info['tracks']['items'][i]['artists']:
-                                if artist_string == "":
-                                    artist_string = artist['name'].replace('*', '-') 
-                                else:
-                                    artist_string += ", " + artist['name'].replace('*', '-')
-                                    
-                            # Hide artist string from song listing if there is only one artist
-                            if len(result_info['tracks']['items'][i]['artists']) == 1:
-                                if songlist_string == "":
-                                    songlist_string = f"{i + 1}. **{result_info['tracks']['items'][i]['name'].replace('*', '-')}**"
-                                else:
-                                    songlist_string += f"\n{i + 1}. **{result_info['tracks']['items'][i]['name'].replace('*', '-')}**"
-                            else:
-                                if songlist_string == "":
-                                    songlist_string = f"{i + 1}. **{result_info['tracks']['items'][i]['name'].replace('*', '-')}** - {artist_string}"
-                                else:
-                                    songlist_string += f"\n{i + 1}. **{result_info['tracks']['items'][i]['name'].replace('*', '-')}** - {artist_string}"
-
-                        artist_string = ""
-                        for artist in result_info['artists']:
-                            if artist_string == "":
-                                artist_string = artist['name'].replace('*', '-') 
-                            else:
-                                artist_string = artist_string + ", " + artist['name'].replace('*', '-')
+                        image_url = color_image(result_info.images).url
                         
-                        embed = discord.Embed(title = f"{result_info['name']} - {artist_string}", description = songlist_string, color = Color.from_rgb(r = 255, g = 255, b = 255))
-                        embed.set_footer(text = "Getting colour information...")
+                        embed = album_embed(result_info)
 
-                        embed.set_thumbnail(url = result_info["images"][0]["url"])
-
-                        view = View(timeout=1800)
+                        view = View(timeout = None)
                         
                         # Add Open in Spotify button
-                        spotify_button = discord.ui.Button(label=f'Show on Spotify', style=discord.ButtonStyle.url, url=result_info['external_urls']['spotify'], row = 0)
+                        spotify_button = discord.ui.Button(label=f'Show on Spotify', style=discord.ButtonStyle.url, url=result_info.url, row = 0)
                         view.add_item(spotify_button)
 
-                        # More Button Callback
-                        async def more_callback(interaction: discord.Interaction):
-                            await interaction.response.defer()
-
-                            view = View()
-
-                            # Add song.link button                
-                            songlink_button = discord.ui.Button(label="Other Streaming Services", style=discord.ButtonStyle.url, url=f"https://song.link/{item['external_urls']['spotify']}", row = 1)
-                            view.add_item(songlink_button)
-
-                            # Add Search on Google button
-                            google_button = discord.ui.Button(label='Search on Google', style=discord.ButtonStyle.url, url=f'https://www.google.com/search?q={(quote(item["name"])).replace("%2B", "+")}+{(quote(artist_string)).replace("%2B", "+")}', row = 1)
-                            view.add_item(google_button)
-
-                            # Album Art Callback
-                            async def art_callback(interaction: discord.Interaction):
-                                await interaction.response.defer()
-                                
-                                embed = discord.Embed(title = "Getting images...", color = Color.orange())
-                                embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                await interaction.edit_original_response(embed = embed, view = None)
-                                
-                                if result_info["images"] != None:
-                                    image_url = result_info["images"][0]["url"]
-
-                                    if result_info["images"][0]['height'] == None or result_info["images"][0]['width'] == None:
-                                        embed = discord.Embed(title = f"{result_info['name']} ({artist_string}) - Album Art", description = "Viewing highest quality (Resolution unknown)", color = Color.from_rgb(r = 255, g = 255, b = 255))
-                                        embed.set_footer(text = "Getting colour information...")
-                                    else:
-                                        embed = discord.Embed(title = f"{result_info['name']} ({artist_string}) - Album Art", description = f"Viewing highest quality ({result_info['images'][0]['width']}x{result_info['images'][0]['height']})", color = Color.from_rgb(r = 255, g = 255, b = 255))
-                                        embed.set_footer(text = "Getting colour information...")
-                                    
-                                    embed.set_image(url = result_info["images"][0]["url"])
-                                    await interaction.edit_original_response(embed = embed)
-
-                                    letters = string.ascii_lowercase
-                                    filename = ''.join(random.choice(letters) for i in range(8))
-
-                                    async with aiohttp.ClientSession() as session:
-                                        async with session.get(image_url) as request:
-                                            file = open(f'{filename}.jpg', 'wb')
-                                            async for chunk in request.content.iter_chunked(10):
-                                                file.write(chunk)
-                                            file.close()
-                                            
-                                    color_thief = ColorThief(f'{filename}.jpg')
-                                    dominant_color = color_thief.get_color(quality=1)
-
-                                    os.remove(f'{filename}.jpg')
-
-                                    if result_info["images"][0]['height'] == None or result_info["images"][0]['width'] == None:
-                                        embed = discord.Embed(title = f"{result_info['name']} ({artist_string}) - Album Art", description = "Viewing highest quality (Resolution unknown)", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                    else:
-                                        embed = discord.Embed(title = f"{result_info['name']} ({artist_string}) - Album Art", description = f"Viewing highest quality ({result_info['images'][0]['width']}x{result_info['images'][0]['height']})", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                    
-                                    embed.set_image(url = result_info["images"][0]["url"])
-                                    await interaction.edit_original_response(embed = embed)
-                                else:
-                                    embed = discord.Embed(title = "No album art available.", color = Color.red())
-                                    embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                                    await interaction.edit_original_response(embed = embed)
-                            
-                            # Add Album Art button
-                            art_button = discord.ui.Button(label='Album Art', style=discord.ButtonStyle.gray, row = 2)
-                            art_button.callback = art_callback
-                            view.add_item(art_button)
-
-                            # Close Button Callback
-                            async def delete_callback(interaction: discord.Interaction):
-                                await interaction.response.defer()
-                                
-                                await msg.delete()
-                            
-                            # Add Close button
-                            close_button = discord.ui.Button(label='Close', style = discord.ButtonStyle.red, row = 2)
-                            close_button.callback = delete_callback
-                            view.add_item(close_button)
-
-                            msg = await interaction.followup.send(view = view)
-                        
                         # Add More Options button
-                        more_button = discord.ui.Button(label=f'More', style=discord.ButtonStyle.gray, row = 0)
-                        more_button.callback = more_callback
-                        view.add_item(more_button)
-
-                        await interaction.edit_original_response(embed = embed, view = view)
-
-                        # Generate random filename
-                        letters = string.ascii_lowercase
-                        filename = ''.join(random.choice(letters) for i in range(8))
-
-                        # Save image
-                        async with aiohttp.ClientSession() as session:
-                            async with session.get(image_url) as request:
-                                file = open(f'{filename}.jpg', 'wb')
-                                async for chunk in request.content.iter_chunked(10):
-                                    file.write(chunk)
-                                file.close()
-                                
-                        # Get dominant colour for embed
-                        color_thief = ColorThief(f'{filename}.jpg')
-                        dominant_color = color_thief.get_color(quality=1)
-
-                        # Remove file when done
-                        os.remove(f'{filename}.jpg')
-
-                        embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
-                        embed.color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2])
-
-                        await interaction.edit_original_response(embed = embed)
+                        view.add_item(ActionButton("spotify-more", "album", result_info.id, label = "More", row = 0))
+
+                        # Sent once the colour is ready, or first in the placeholder colour if it takes a while
+                        await send_with_color(self.bot.colors, embed, image_url, lambda embed: interaction.edit_original_response(embed = embed, view = view), f"Requested by {interaction.user.name}", interaction.user.avatar.url)
                     
                     # Set up list with provided values
                     select.callback = response
@@ -579,13 +244,12 @@ class spotify(commands.Cog):
                     view.add_item(select)
 
                     # Edit initial message to show dropdown
-                    await interaction.edit_original_response(embed = embed, view = view)
+                    await responder.update(embed = embed, view = view)
         except Exception as error:
-            await interaction.response.defer(ephemeral = True)
             embed = discord.Embed(title = "Spotify - Error", description = "An unknown error has occurred. The error has been logged.")
             print("[SPOTIFY] Error has occurred. Error below:")
             print(error)
-            await interaction.edit_original_response(embed = embed, view = None, ephemeral = True)
+            await responder.update(embed = embed, view = None)
 
     # Spotify Image command
     @spotifyGroup.command(name = "image", description = "Get high quality album art from a Spotify URL.")
@@ -600,12 +264,7 @@ class spotify(commands.Cog):
                 embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
                 await interaction.followup.send(embed = embed)
                 
-                url = url.replace('www.', '').replace('http://', '').replace('https://', '').rstrip('/')
-                url = f"https://{url}"
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as request:
-                        url = str(request.url)
+                url = await self.bot.spotify_links.resolve(url)
                     
                 url_expanded = True
             except Exception as error:
@@ -631,42 +290,17 @@ class spotify(commands.Cog):
         else:
             await interaction.followup.send(embed = embed)
 
-        artist_string = ""
-
         try:
             if "track" in url:
-                result = self.sp.track(url)
-                
-                for artist in result['artists']:
-                    if artist_string == "":
-                        artist_string = artist['name'] 
-                    else:
-                        artist_string += f", {artist['name']}"
-
-                if result["album"]["images"] != None:
-                    image_url = result["album"]["images"][0]["url"]
-
-                    letters = string.ascii_lowercase
-                    filename = ''.join(random.choice(letters) for i in range(8))
-
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(image_url) as request:
-                            file = open(f'{filename}.jpg', 'wb')
-                            async for chunk in request.content.iter_chunked(10):
-                                file.write(chunk)
-                            file.close()
-                            
-                    color_thief = ColorThief(f'{filename}.jpg')
-                    dominant_color = color_thief.get_color(quality=1)
-
-                    os.remove(f'{filename}.jpg')
-                    
-                    if result["album"]["images"][0]['height'] == None or result["album"]["images"][0]['width'] == None:
-                        embed = discord.Embed(title = f"{result['name']} ({artist_string}) - Album Art", description = "Viewing highest quality (Resolution unknown)", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                    else:
-                        embed = discord.Embed(title = f"{result['name']} ({artist_string}) - Album Art", description = f"Viewing highest quality ({result['album']['images'][0]['width']}x{result['album']['images'][0]['height']})", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
+                result = await self.bot.spotify.track(url)
+
+                if result.album.images != None:
+                    image_url = color_image(result.album.images).url
+
+                    # Get dominant colour for embed
+                    dominant_color = await self.bot.colors.dominant_color(image_url)
                     
-                    embed.set_image(url = result["album"]["images"][0]["url"])
+                    embed = art_embed(f"{result.name} ({artist_names(result.artists)}) - Album Art", result.album.images[0], color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
                     embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
                     await interaction.edit_original_response(embed = embed)
                 else:
@@ -674,41 +308,15 @@ class spotify(commands.Cog):
                     embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
                     await interaction.edit_original_response(embed = embed)
             elif "album" in url:
-                result = self.sp.album(url)
+                result = await self.bot.spotify.album(url)
                 
-                image_url = result["images"][0]["url"]
-
-                # Generate random filename
-                letters = string.ascii_lowercase
-                filename = ''.join(random.choice(letters) for i in range(8))
-
-                # Save image
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(image_url) as request:
-                        file = open(f'{filename}.jpg', 'wb')
-                        async for chunk in request.content.iter_chunked(10):
-                            file.write(chunk)
-                        file.close()
-                        
+                image_url = color_image(result.images).url
+
                 # Get dominant colour for embed
-                color_thief = ColorThief(f'{filename}.jpg')
-                dominant_color = color_thief.get_color(quality=1)
-
-                # Remove file when done
-                os.remove(f'{filename}.jpg')
-
-                for artist in result['artists']:
-                    if artist_string == "":
-                        artist_string = artist['name'] 
-                    else:
-                        artist_string += f", {artist['name']}"
-
-                if result["images"] != None:
-                    if result["images"][0]['height'] == None or result["images"][0]['width'] == None:
-                        embed = discord.Embed(title = f"{result['name']} ({artist_string}) - Album Art", description = "Viewing highest quality (Resolution unknown)", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                    else:
-                        embed = discord.Embed(title = f"{result['name']} ({artist_string}) - Album Art", description = f"Viewing highest quality ({result['images'][0]['width']}x{result['images'][0]['height']})", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                    embed.set_image(url = result["images"][0]["url"])
+                dominant_color = await self.bot.colors.dominant_color(image_url)
+
+                if result.images != None:
+                    embed = art_embed(f"{result.name} ({artist_names(result.artists)}) - Album Art", result.images[0], color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
                     embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
                     await interaction.edit_original_response(embed = embed)
                 else:
@@ -718,35 +326,15 @@ class spotify(commands.Cog):
             # Playlist URL
             elif "playlist" in url:
                 # Search playlist on Spotify
-                result = self.sp.playlist(url, market="GB")
-
-                image_url = result["images"][0]["url"]
+                result = await self.bot.spotify.playlist(url, market="GB")
 
-                # Generate random filename
-                letters = string.ascii_lowercase
-                filename = ''.join(random.choice(letters) for i in range(8))
+                image_url = color_image(result.images).url
 
-                # Save image
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(image_url) as request:
-                        file = open(f'{filename}.jpg', 'wb')
-                        async for chunk in request.content.iter_chunked(10):
-                            file.write(chunk)
-                        file.close()
-                        
                 # Get dominant colour for embed
-                color_thief = ColorThief(f'{filename}.jpg')
-                dominant_color = color_thief.get_color(quality=1)
-
-                # Remove file when done
-                os.remove(f'{filename}.jpg')
-
-                if result["images"] != None:
-                    if result["images"][0]['height'] == None or result["images"][0]['width'] == None:
-                        embed = discord.Embed(title = f"{result['name']} - {result['owner']['display_name']} (Playlist) - Cover Art", description = "Viewing highest quality (Resolution unknown)", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                    else:
-                        embed = discord.Embed(title = f"{result['name']} - {result['owner']['display_name']} (Playlist) - Cover Art", description = f"Viewing highest quality ({result['images'][0]['width']}x{result['images'][0]['height']})", color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
-                    embed.set_image(url = result["images"][0]["url"])
+                dominant_color = await self.bot.colors.dominant_color(image_url)
+
+                if result.images != None:
+                    embed = art_embed(f"{result.name} - {result.owner_name} (Playlist) - Cover Art", result.images[0], color = Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2]))
                     embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
                     await interaction.edit_original_response(embed = embed)
                 else:
@@ -757,7 +345,7 @@ class spotify(commands.Cog):
                 embed = discord.Embed(title = "Error", description = "Error while searching URL. Is it a valid and supported Spotify URL?", color = Color.red())
                 embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
                 await interaction.edit_original_response(embed = embed)
-        except spotipy.exceptions.SpotifyException:
+        except SpotifyError:
             embed = discord.Embed(title = "Error", description = "Error while searching URL. Is it a valid and supported Spotify URL?", color = Color.red())
             embed.set_footer(text = f"Requested by {interaction.user.name}", icon_url = interaction.user.avatar.url)
             await interaction.edit_original_response(embed = embed)
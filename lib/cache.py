@@ -0,0 +1,127 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+
+# All live caches by name, used by /bot cache-stats
+registry = weakref.WeakValueDictionary()
+
+class TTLCache:
+    """Size-bounded LRU cache where each entry expires after its own TTL.
+
+    Hits and misses are counted so cache performance can be checked with `/bot cache-stats`."""
+
+    def __init__(self, name: str, maxsize: int = 1024):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> (expiry time, value), least recently used first
+        self._data = OrderedDict()
+
+        registry[name] = self
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry != None and entry[0] > time.monotonic()
+
+    # Get value, returns default if missing or expired
+    def get(self, key, default = None):
+        entry = self._data.get(key)
+
+        if entry == None:
+            self.misses += 1
+            return default
+
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    # Add value, evicting least recently used entries when full
+    def set(self, key, value, ttl: float):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last = False)
+            self.evictions += 1
+
+    def pop(self, key, default = None):
+        entry = self._data.pop(key, None)
+        return default if entry == None else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+class PersistentCache:
+    """Key/value store backed by a SQLite file, holding zlib-compressed JSON.
+
+    Each entry records when it was fetched, so callers can decide whether it is still fresh.
+    Queries run in a worker thread to keep disk access off the event loop."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread = False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, data BLOB NOT NULL) WITHOUT ROWID")
+        self.connection.commit()
+
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            row = self.connection.execute("SELECT fetched_at, data FROM cache WHERE key = ?", (key,)).fetchone()
+
+        if row == None:
+            return None
+
+        return json.loads(zlib.decompress(row[1])), row[0]
+
+    def _set(self, key, value, fetched_at):
+        data = zlib.compress(json.dumps(value, separators = (",", ":")).encode())
+
+        with self._lock:
+            self.connection.execute("INSERT OR REPLACE INTO cache (key, fetched_at, data) VALUES (?, ?, ?)", (key, fetched_at, data))
+            self.connection.commit()
+
+    # Get (value, fetched_at) for a key, or None if it isn't stored
+    async def get(self, key):
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key, value, fetched_at: float = None):
+        await asyncio.to_thread(self._set, key, value, time.time() if fetched_at == None else fetched_at)
+
+    # Remove entries older than max_age seconds
+    def prune(self, max_age: float):
+        with self._lock:
+            self.connection.execute("DELETE FROM cache WHERE fetched_at < ?", (time.time() - max_age,))
+            self.connection.commit()
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
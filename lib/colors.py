@@ -0,0 +1,144 @@
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+import numpy as np
+import multiprocessing
+import asyncio
+import re
+import io
+
+from lib.cache import TTLCache, PersistentCache
+from lib.images import ImageFetcher
+from lib.palette import get_color
+from lib.singleflight import SingleFlight
+
+# Larger images are shrunk to fit in this size before quantisation
+MAX_SIZE = 640
+
+# Smallest image variant used for colours. Spotify serves 640, 300 and 64px covers, but
+# colours from the 300px ones often differ from ColorThief's (see benchmarks/palette.py).
+COLOR_IMAGE_SIZE = 640
+
+# How worker processes are started. By the first colour request the bot is running other
+# threads (database, to_thread and BLAS pools), and forking those can deadlock the child.
+# forkserver isn't available on Windows, which uses spawn.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Used when an image has no usable pixels, matches the placeholder embed colour
+DEFAULT_COLOR = (255, 255, 255)
+
+# How long to wait for a colour before sending an embed without it, in seconds
+DEFAULT_DEADLINE = 1.5
+
+# How long colours stay in memory. Spotify image URLs are content addressed, so a
+# colour never goes out of date.
+COLOR_TTL = 30 * 24 * 60 * 60
+
+# Colours not stored for this long are dropped from disk on startup, keeping the table small
+DISK_TTL = 180 * 24 * 60 * 60
+
+# Spotify CDN image URLs, the hash identifies the image whatever the host or size path
+_image_hash_regex = re.compile(r"^https?://[^/]*scdn\.co/image/(?P<hash>[0-9a-f]+)")
+
+# Get the cache key for an image URL
+def _image_key(url):
+    match = _image_hash_regex.match(url)
+    return match.group("hash") if match != None else url
+
+# Pick the smallest image that is still big enough for colour extraction, images with
+# unknown sizes are treated as large
+def color_image(images, min_size = COLOR_IMAGE_SIZE):
+    suitable = [image for image in images if image.width == None or image.width >= min_size]
+    if not suitable:
+        return images[0]
+
+    return min(suitable, key = lambda image: image.width or float("inf"))
+
+# Runs in a worker process. Decodes the image once and finds its dominant colour
+# the same way as ColorThief.get_color(quality = 1).
+def _dominant_color(data):
+    image = Image.open(io.BytesIO(data))
+
+    # Let the JPEG decoder scale down large images while decoding
+    if max(image.size) > MAX_SIZE:
+        image.draft("RGB", (MAX_SIZE, MAX_SIZE))
+        image.thumbnail((MAX_SIZE, MAX_SIZE))
+
+    try:
+        return get_color(np.asarray(image.convert("RGBA")))
+    except ValueError:
+        # No usable pixels, e.g. a fully white image
+        return DEFAULT_COLOR
+
+class ColorService:
+    """Finds the dominant colour of images, shared by all cogs through `bot.colors`.
+
+    Images are downloaded into memory and quantised in a process pool, so colour
+    extraction doesn't block the event loop or write temporary files. Colours are
+    cached by image hash in memory and on disk, and checked before downloading."""
+
+    def __init__(self, images: ImageFetcher, workers: int = 2, cache_size: int = 4096, cache_path: str = None, deadline: float = DEFAULT_DEADLINE):
+        self.images = images
+        self.deadline = deadline
+        self.cache = TTLCache("colors", maxsize = cache_size)
+        if cache_path != None:
+            self.disk_cache = PersistentCache(cache_path)
+            self.disk_cache.prune(DISK_TTL)
+        else:
+            self.disk_cache = None
+
+        self._pool = ProcessPoolExecutor(max_workers = workers, mp_context = multiprocessing.get_context(START_METHOD))
+        self._flights = SingleFlight()
+
+    async def _dominant_color(self, url, key):
+        color = None
+
+        if self.disk_cache != None:
+            stored = await self.disk_cache.get(key)
+            if stored != None:
+                color = tuple(stored[0])
+
+        if color == None:
+            data = await self.images.fetch(url)
+            color = tuple(await asyncio.get_running_loop().run_in_executor(self._pool, _dominant_color, data))
+
+            if self.disk_cache != None:
+                await self.disk_cache.set(key, color)
+
+        self.cache.set(key, color, COLOR_TTL)
+        return color
+
+    # Get the dominant colour of an image as an (r, g, b) tuple
+    async def dominant_color(self, url):
+        key = _image_key(url)
+
+        color = self.cache.get(key)
+        if color != None:
+            return color
+
+        return await self._flights.do(key, self._dominant_color, url, key)
+
+    # Wait up to the deadline (seconds) for an image's colour, returns None if it isn't ready
+    # in time. The lookup carries on in the background, so calling dominant_color() after
+    # a timeout picks up the same result.
+    async def color_within(self, url, deadline: float = None):
+        key = _image_key(url)
+
+        color = self.cache.get(key)
+        if color != None:
+            return color
+
+        task = asyncio.ensure_future(self._flights.do(key, self._dominant_color, url, key))
+        done, pending = await asyncio.wait((task,), timeout = self.deadline if deadline == None else deadline)
+
+        if task in done:
+            return task.result()
+
+        # Errors are raised by the later dominant_color() call instead
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return None
+
+    def close(self):
+        self._pool.shutdown(wait = False, cancel_futures = True)
+
+        if self.disk_cache != None:
+            self.disk_cache.close()
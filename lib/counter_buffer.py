@@ -0,0 +1,87 @@
+import asyncio
+
+class CounterBuffer:
+    """Adds up counters in memory and writes them out in batches (write-behind).
+
+    `write(counts)` is a coroutine given {key: [totals...]}, which should write everything
+    in one transaction off the event loop. It runs every `interval` seconds, once
+    `max_pending` updates have been added, and on `close()`. If it fails, the counts are
+    kept and added to the next batch."""
+
+    def __init__(self, write, interval: float = 30, max_pending: int = 500):
+        self.write = write
+        self.interval = interval
+        self.max_pending = max_pending
+
+        # key -> list of totals since the last flush
+        self._pending = {}
+        self._updates = 0
+
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._flush_task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def start(self):
+        if self._task == None:
+            self._task = asyncio.ensure_future(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._try_flush()
+
+    async def _try_flush(self):
+        try:
+            await self.flush()
+        except Exception as error:
+            print(f"[COUNTERS] Flush failed, the counts will be written with the next one: {error}")
+
+    # Add to the totals for key, flushing in the background once enough updates are waiting
+    def add(self, key, *values):
+        totals = self._pending.get(key)
+
+        if totals == None:
+            self._pending[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                totals[i] += value
+
+        self._updates += 1
+        if self._updates >= self.max_pending and (self._flush_task == None or self._flush_task.done()):
+            self._flush_task = asyncio.ensure_future(self._try_flush())
+
+    # Write all waiting counts now. The flush runs shielded: once a write has started it may
+    # commit even if the caller is cancelled, so cancelling only stops the caller waiting.
+    async def flush(self):
+        await asyncio.shield(self._flush())
+
+    async def _flush(self):
+        async with self._lock:
+            if self._pending == {}:
+                return
+
+            counts = self._pending
+            self._pending = {}
+            self._updates = 0
+
+            try:
+                await self.write(counts)
+            except Exception:
+                # Put the counts back, merging in anything added while writing. Not done
+                # when cancelled, as the write may still have committed.
+                for key, values in counts.items():
+                    totals = self._pending.setdefault(key, [0] * len(values))
+                    for i, value in enumerate(values):
+                        totals[i] += value
+                raise
+
+    # Stop flushing on a timer and write what's left, after any flush that's running
+    async def close(self):
+        if self._task != None:
+            self._task.cancel()
+            self._task = None
+
+        await self.flush()
@@ -0,0 +1,21 @@
+import aiohttp
+
+from lib.singleflight import SingleFlight
+
+class ImageFetcher:
+    """Downloads images through the shared session, shared by all cogs through `bot.images`.
+
+    Concurrent downloads of the same URL share one request."""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+        self._flights = SingleFlight()
+
+    async def _fetch(self, url):
+        async with self.session.get(url) as request:
+            request.raise_for_status()
+            return await request.read()
+
+    # Download an image, returns its bytes
+    async def fetch(self, url):
+        return await self._flights.do(url, self._fetch, url)
@@ -0,0 +1,304 @@
+import asyncio
+import datetime
+import pathlib
+import queue
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Leaderboard database schema and storage. Counts for every server are in one `stats`
+# table keyed by (guild ID, user ID), and servers with the leaderboard enabled are listed
+# in `guilds`. Counts for the current day, week and month are kept in `periods`, one
+# bucket per period, server and user. Older versions made a table per server, named by
+# the guild ID, with users stored as mention strings. migrate() moves those into `stats`.
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS guilds (guild_id INTEGER PRIMARY KEY)",
+    "CREATE TABLE IF NOT EXISTS stats (guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, messages INTEGER NOT NULL DEFAULT 0, words INTEGER NOT NULL DEFAULT 0, attachments INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (guild_id, user_id)) WITHOUT ROWID",
+
+    # One covering index per sort column, so a page of the leaderboard is a seek into a
+    # server's part of the index, read in order, whatever the number of users
+    "CREATE INDEX IF NOT EXISTS stats_messages ON stats (guild_id, messages, user_id)",
+    "CREATE INDEX IF NOT EXISTS stats_words ON stats (guild_id, words, user_id)",
+    "CREATE INDEX IF NOT EXISTS stats_attachments ON stats (guild_id, attachments, user_id)",
+
+    # Buckets start on the first day of their period, as a date ordinal. Keyed by period and
+    # start first, so compact() deletes ended periods with a range delete.
+    "CREATE TABLE IF NOT EXISTS periods (period TEXT NOT NULL, start INTEGER NOT NULL, guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, messages INTEGER NOT NULL DEFAULT 0, words INTEGER NOT NULL DEFAULT 0, attachments INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (period, start, guild_id, user_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS periods_messages ON periods (period, start, guild_id, messages, user_id)",
+    "CREATE INDEX IF NOT EXISTS periods_words ON periods (period, start, guild_id, words, user_id)",
+    "CREATE INDEX IF NOT EXISTS periods_attachments ON periods (period, start, guild_id, attachments, user_id)",
+)
+
+# Add counts to a user's totals, adding the user if they aren't on the leaderboard yet
+UPSERT = "INSERT INTO stats (guild_id, user_id, messages, words, attachments) VALUES (?, ?, ?, ?, ?) ON CONFLICT (guild_id, user_id) DO UPDATE SET messages = messages + excluded.messages, words = words + excluded.words, attachments = attachments + excluded.attachments"
+
+# Same as UPSERT, also giving the user's new totals
+UPSERT_RETURNING = UPSERT + " RETURNING messages, words, attachments"
+
+# Add counts to a user's bucket for a period
+UPSERT_PERIOD = "INSERT INTO periods (period, start, guild_id, user_id, messages, words, attachments) VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (period, start, guild_id, user_id) DO UPDATE SET messages = messages + excluded.messages, words = words + excluded.words, attachments = attachments + excluded.attachments"
+
+# Columns the leaderboard can be sorted by
+COLUMNS = ("messages", "words", "attachments")
+
+# Periods with their own leaderboards
+PERIODS = ("day", "week", "month")
+
+# The writer uses WAL so reads never wait for writes, and only syncs on checkpoints
+WRITER_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+)
+
+READER_PRAGMAS = (
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA mmap_size = 67108864",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Date ordinal of 1970-01-01, UTC days are counted on from it
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# The UTC date of a timestamp (default now) as a date ordinal, cheap enough to call per message
+def utc_day(now: float = None):
+    return int((time.time() if now == None else now) // 86400) + EPOCH_ORDINAL
+
+# Start of the day, week (from Monday) and month containing a UTC day (default today), as date ordinals
+def period_starts(day: int = None):
+    date = datetime.date.fromordinal(utc_day() if day == None else day)
+
+    return {
+        "day": date.toordinal(),
+        "week": date.toordinal() - date.weekday(),
+        "month": date.replace(day = 1).toordinal(),
+    }
+
+# Table, filter and parameters for a server's all time (period None) or current period leaderboard
+def _scope(guild_id: int, period: str = None):
+    if period == None:
+        return "stats", "guild_id = ?", (guild_id,)
+
+    if period not in PERIODS:
+        raise ValueError(f"Unknown leaderboard period: {period}")
+
+    return "periods", "period = ? AND start = ? AND guild_id = ?", (period, period_starts()[period], guild_id)
+
+def create_schema(connection: sqlite3.Connection):
+    with connection:
+        for statement in SCHEMA:
+            connection.execute(statement)
+
+# Per-server tables from older versions, their names are guild IDs
+def legacy_tables(connection: sqlite3.Connection):
+    return [name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'") if name.isdigit()]
+
+# Move the per-server tables into `stats`, one transaction per server. Rows are copied by
+# SQLite with INSERT ... SELECT, so tables aren't loaded into memory. Mentions ("<@id>" or
+# "<@!id>") are turned back into user IDs. Returns the number of servers migrated.
+def migrate(connection: sqlite3.Connection):
+    create_schema(connection)
+    tables = legacy_tables(connection)
+
+    for name in tables:
+        with connection:
+            connection.execute("INSERT OR IGNORE INTO guilds (guild_id) VALUES (?)", (int(name),))
+
+            # "WHERE true" is needed by SQLite to parse the upsert after a SELECT
+            connection.execute(f"""INSERT INTO stats (guild_id, user_id, messages, words, attachments)
+                SELECT ?, CAST(trim(userMention, '<@!>') AS INTEGER), messageCount, wordCount, attachmentCount FROM "{name}" WHERE true
+                ON CONFLICT (guild_id, user_id) DO UPDATE SET messages = messages + excluded.messages, words = words + excluded.words, attachments = attachments + excluded.attachments""", (int(name),))
+
+            connection.execute(f'DROP TABLE "{name}"')
+
+    return len(tables)
+
+class LeaderboardStore:
+    """Async access to the leaderboard database.
+
+    All writes go through one connection on a dedicated writer thread, in the order they
+    were made. Queries run on a pool of read-only connections in their own threads, so a
+    large read never waits for a write or holds up the event loop."""
+
+    def __init__(self, path: str, readers: int = 2):
+        self.path = path
+        self.readers = readers
+
+        self._writer = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "leaderboard-writer")
+        self._reader = ThreadPoolExecutor(max_workers = readers, thread_name_prefix = "leaderboard-reader")
+
+        self._write_connection = None
+        self._read_connections = queue.SimpleQueue()
+
+    # Open the connections and migrate old tables, returns the number of servers migrated
+    async def open(self):
+        return await asyncio.get_running_loop().run_in_executor(self._writer, self._open)
+
+    def _open(self):
+        connection = sqlite3.connect(self.path, check_same_thread = False)
+        for pragma in WRITER_PRAGMAS:
+            connection.execute(pragma)
+
+        migrated = migrate(connection)
+        self._write_connection = connection
+
+        # Readers are opened once the database exists, in WAL mode
+        uri = pathlib.Path(self.path).resolve().as_uri() + "?mode=ro"
+        for i in range(self.readers):
+            connection = sqlite3.connect(uri, uri = True, check_same_thread = False)
+            for pragma in READER_PRAGMAS:
+                connection.execute(pragma)
+            self._read_connections.put(connection)
+
+        return migrated
+
+    # Run func(connection, *args) in one transaction on the writer thread
+    async def _write(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._writer, self._in_transaction, func, args)
+
+    def _in_transaction(self, func, args):
+        with self._write_connection:
+            return func(self._write_connection, *args)
+
+    # Run func(connection, *args) with a read-only connection from the pool
+    async def _read(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._reader, self._with_reader, func, args)
+
+    def _with_reader(self, func, args):
+        connection = self._read_connections.get()
+        try:
+            return func(connection, *args)
+        finally:
+            self._read_connections.put(connection)
+
+    async def enabled_guilds(self):
+        return await self._read(lambda connection: {guild_id for (guild_id,) in connection.execute("SELECT guild_id FROM guilds")})
+
+    async def enable(self, guild_id: int):
+        await self._write(lambda connection: connection.execute("INSERT OR IGNORE INTO guilds (guild_id) VALUES (?)", (guild_id,)))
+
+    # Disable the leaderboard for a server, deleting its counts
+    async def disable(self, guild_id: int):
+        def disable(connection):
+            connection.execute("DELETE FROM stats WHERE guild_id = ?", (guild_id,))
+            connection.execute("DELETE FROM periods WHERE guild_id = ?", (guild_id,))
+            connection.execute("DELETE FROM guilds WHERE guild_id = ?", (guild_id,))
+
+        await self._write(disable)
+
+    async def reset(self, guild_id: int):
+        def reset(connection):
+            connection.execute("DELETE FROM stats WHERE guild_id = ?", (guild_id,))
+            connection.execute("DELETE FROM periods WHERE guild_id = ?", (guild_id,))
+
+        await self._write(reset)
+
+    async def reset_user(self, guild_id: int, user_id: int):
+        def reset_user(connection):
+            connection.execute("DELETE FROM stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+            connection.execute("DELETE FROM periods WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+
+        await self._write(reset_user)
+
+    # Add counts to the all time totals and the period buckets, rows are (guild ID, user ID,
+    # day, messages, words, attachments) with the UTC day (see utc_day()) the counts were made
+    # on, so counts written after a period ends still go to its bucket. Returns the new all
+    # time (messages, words, attachments) totals for each row.
+    async def add_counts(self, rows):
+        def add_counts(connection):
+            period_rows = []
+            for guild_id, user_id, day, *counts in rows:
+                starts = period_starts(day)
+                period_rows.extend((period, starts[period], guild_id, user_id, *counts) for period in PERIODS)
+
+            connection.executemany(UPSERT_PERIOD, period_rows)
+            return [connection.execute(UPSERT_RETURNING, (guild_id, user_id, *counts)).fetchone() for guild_id, user_id, day, *counts in rows]
+
+        return await self._write(add_counts)
+
+    # Delete buckets for periods that have ended, returns the number of buckets deleted
+    async def compact(self):
+        def compact(connection):
+            starts = period_starts()
+            return sum(connection.execute("DELETE FROM periods WHERE period = ? AND start < ?", (period, starts[period])).rowcount for period in PERIODS)
+
+        return await self._write(compact)
+
+    # Every value in each column for a server, lowest first. Read on the writer thread, so
+    # it includes every write made before it and none made after.
+    async def column_values(self, guild_id: int):
+        return await self._write(lambda connection: {column: [value for (value,) in connection.execute(f"SELECT {column} FROM stats WHERE guild_id = ? ORDER BY {column}", (guild_id,))] for column in COLUMNS})
+
+    # A user's value in each column with the users ranked just above and below them, as
+    # {column: (value, above, below)} where above and below are (user ID, value) or None.
+    # Returns None if the user isn't on the server's leaderboard.
+    async def neighbours(self, guild_id: int, user_id: int):
+        def neighbours(connection):
+            row = connection.execute("SELECT messages, words, attachments FROM stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id)).fetchone()
+            if row == None:
+                return None
+
+            result = {}
+            for column, value in zip(COLUMNS, row):
+                above = connection.execute(f"SELECT user_id, {column} FROM stats WHERE guild_id = ? AND ({column}, user_id) > (?, ?) ORDER BY {column}, user_id LIMIT 1", (guild_id, value, user_id)).fetchone()
+                below = connection.execute(f"SELECT user_id, {column} FROM stats WHERE guild_id = ? AND ({column}, user_id) < (?, ?) ORDER BY {column} DESC, user_id DESC LIMIT 1", (guild_id, value, user_id)).fetchone()
+                result[column] = (value, above, below)
+
+            return result
+
+        return await self._read(neighbours)
+
+    # A page of users in a server and their value for column, as (user ID, value) rows
+    # highest first, all time or for the current period. Pages are found from the (value,
+    # user ID) key of the row next to them (keyset pagination): forward gives the rows ranked
+    # below key, backward the rows ranked above it. Without a key, forward gives the top of
+    # the leaderboard and backward the bottom.
+    async def page(self, guild_id: int, column: str, key: tuple = None, forward: bool = True, limit: int = 10, period: str = None):
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown leaderboard column: {column}")
+
+        order = "DESC" if forward else "ASC"
+        table, where, params = _scope(guild_id, period)
+        sql = f"SELECT user_id, {column} FROM {table} WHERE {where}"
+
+        if key != None:
+            sql += f" AND ({column}, user_id) {'<' if forward else '>'} (?, ?)"
+            params += tuple(key)
+
+        sql += f" ORDER BY {column} {order}, user_id {order} LIMIT ?"
+        rows = await self._read(lambda connection: connection.execute(sql, (*params, limit)).fetchall())
+
+        return rows if forward else rows[::-1]
+
+    # Number of users on a server's all time or current period leaderboard
+    async def count(self, guild_id: int, period: str = None):
+        table, where, params = _scope(guild_id, period)
+        return await self._read(lambda connection: connection.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0])
+
+    # Close all connections once queued writes and running reads have finished
+    async def close(self):
+        if self._write_connection != None:
+            await asyncio.get_running_loop().run_in_executor(self._writer, self._close)
+
+        self._writer.shutdown()
+        self._reader.shutdown()
+
+    def _close(self):
+        self._write_connection.close()
+
+        for i in range(self.readers):
+            self._read_connections.get().close()
+
+# Run the migration on a database file: python -m lib.leaderboard_db content/sql/lb.db
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m lib.leaderboard_db <path to lb.db>")
+        sys.exit(1)
+
+    connection = sqlite3.connect(sys.argv[1])
+    print(f"Migrated {migrate(connection)} servers.")
+    connection.close()
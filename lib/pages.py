@@ -0,0 +1,76 @@
+from array import array
+from itertools import accumulate, islice
+
+# Page storage shared by the paginators. The source (a string or a sequence of rows) is
+# stored once, with an array of the offsets where each page starts, and pages are only
+# sliced out when they are shown.
+
+class Pages:
+    """Pages of a string or sequence, stored as the source plus page start offsets.
+
+    `gap` characters (the separator) are left out at the end of each page. Text pages
+    longer than `limit` are cut when read, ending with "..."."""
+
+    def __init__(self, source, offsets: array, gap: int = 0, limit: int = None):
+        self.source = source
+        self.offsets = offsets
+        self.gap = gap
+        self.limit = limit
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, page):
+        if page < 0:
+            page += len(self.offsets)
+        if not 0 <= page < len(self.offsets):
+            raise IndexError("page out of range")
+
+        start = self.offsets[page]
+        end = self.offsets[page + 1] - self.gap if page + 1 < len(self.offsets) else len(self.source)
+        content = self.source[start:end]
+
+        if self.limit != None and len(content) > self.limit:
+            content = content[:self.limit - 3] + "..."
+
+        return content
+
+    def __iter__(self):
+        for page in range(len(self.offsets)):
+            yield self[page]
+
+# Split text into pages at separators, fitting as many chunks into each page as limit allows.
+# Chunks longer than limit get a page of their own and are cut when read.
+def paginate_text(text: str, sep: str, limit: int):
+    offsets = array("I", [0])
+    page_start = 0
+    chunk_start = 0
+
+    while True:
+        chunk_end = text.find(sep, chunk_start)
+        if chunk_end == -1:
+            chunk_end = len(text)
+
+        # Start a new page at this chunk if it doesn't fit on the current one
+        if chunk_start > page_start and chunk_end - page_start > limit:
+            offsets.append(chunk_start)
+            page_start = chunk_start
+
+        if chunk_end == len(text):
+            break
+
+        chunk_start = chunk_end + len(sep)
+
+    return Pages(text, offsets, len(sep), limit)
+
+# Join lines into text once, with a page starting every per_page lines
+def paginate_lines(lines, per_page: int, sep: str = "\n", limit: int = None):
+    # Line i starts after the lengths of the lines before it and i separators
+    starts = enumerate(accumulate(map(len, lines), initial = 0))
+    offsets = array("I", (length + i * len(sep) for i, length in islice(starts, 0, len(lines), per_page)))
+
+    return Pages(sep.join(lines), offsets, len(sep), limit)
+
+# Pages of per_page rows, the rows are only sliced when a page is shown
+def paginate_rows(rows, per_page: int):
+    return Pages(rows, array("I", range(0, len(rows), per_page)))
@@ -0,0 +1,162 @@
+import numpy as np
+
+# NumPy port of the MMCQ (modified median cut quantisation) used by ColorThief. The
+# histogram and box sums are done with array operations instead of per pixel Python
+# loops, while the cutting logic follows ColorThief step by step, so the palettes match.
+
+SIGBITS = 5
+RSHIFT = 8 - SIGBITS
+MAX_ITERATION = 1000
+FRACT_BY_POPULATIONS = 0.75
+
+class _VBox:
+    __slots__ = ("box", "count", "volume")
+
+    def __init__(self, histo, box):
+        r1, r2, g1, g2, b1, b2 = box
+        self.box = box
+        self.count = int(histo[r1:r2 + 1, g1:g2 + 1, b1:b2 + 1].sum())
+        self.volume = (r2 - r1 + 1) * (g2 - g1 + 1) * (b2 - b1 + 1)
+
+    def avg(self, histo):
+        r1, r2, g1, g2, b1, b2 = self.box
+        mult = 1 << RSHIFT
+
+        if not self.count:
+            return (int(mult * (r1 + r2 + 1) / 2), int(mult * (g1 + g2 + 1) / 2), int(mult * (b1 + b2 + 1) / 2))
+
+        sub = histo[r1:r2 + 1, g1:g2 + 1, b1:b2 + 1]
+        r_sum = float(sub.sum(axis = (1, 2)) @ ((np.arange(r1, r2 + 1) + 0.5) * mult))
+        g_sum = float(sub.sum(axis = (0, 2)) @ ((np.arange(g1, g2 + 1) + 0.5) * mult))
+        b_sum = float(sub.sum(axis = (0, 1)) @ ((np.arange(b1, b2 + 1) + 0.5) * mult))
+
+        return (int(r_sum / self.count), int(g_sum / self.count), int(b_sum / self.count))
+
+def _median_cut(histo, vbox):
+    if not vbox.count:
+        return None, None
+    if vbox.count == 1:
+        return vbox, None
+
+    r1, r2, g1, g2, b1, b2 = vbox.box
+    sub = histo[r1:r2 + 1, g1:g2 + 1, b1:b2 + 1]
+    widths = (r2 - r1 + 1, g2 - g1 + 1, b2 - b1 + 1)
+
+    # Cut along the widest axis, preferring r then g then b on ties
+    axis = widths.index(max(widths))
+    others = tuple(i for i in range(3) if i != axis)
+    partialsum = np.cumsum(sub.sum(axis = others))
+    total = int(partialsum[-1])
+
+    dim1 = vbox.box[axis * 2]
+    dim2 = vbox.box[axis * 2 + 1]
+
+    # Sums keyed by the absolute position along the axis, 0 / None outside the box like ColorThief's dicts
+    def partial(d):
+        return int(partialsum[d - dim1]) if dim1 <= d <= dim2 else 0
+
+    def lookahead(d):
+        return total - int(partialsum[d - dim1]) if dim1 <= d <= dim2 else None
+
+    above = np.nonzero(partialsum > total / 2)[0]
+    if not len(above):
+        return None, None
+
+    i = dim1 + int(above[0])
+    left = i - dim1
+    right = dim2 - i
+    if left <= right:
+        d2 = min(dim2 - 1, int(i + right / 2))
+    else:
+        d2 = max(dim1, int(i - 1 - left / 2))
+
+    # Avoid 0 count boxes
+    while not partial(d2):
+        d2 += 1
+    count2 = lookahead(d2)
+    while not count2 and partial(d2 - 1):
+        d2 -= 1
+        count2 = lookahead(d2)
+
+    box1 = list(vbox.box)
+    box2 = list(vbox.box)
+    box1[axis * 2 + 1] = d2
+    box2[axis * 2] = d2 + 1
+
+    return _VBox(histo, tuple(box1)), _VBox(histo, tuple(box2))
+
+# Pop the largest box by key, matching ColorThief's stable sort + pop
+def _pop(boxes, key):
+    boxes.sort(key = key)
+    return boxes.pop()
+
+def _iterate(histo, boxes, key, target):
+    n_color = 1
+    n_iter = 0
+
+    while n_iter < MAX_ITERATION:
+        vbox = _pop(boxes, key)
+        if not vbox.count:
+            boxes.append(vbox)
+            n_iter += 1
+            continue
+
+        vbox1, vbox2 = _median_cut(histo, vbox)
+        if vbox1 == None:
+            raise ValueError("Median cut failed to split a box.")
+
+        boxes.append(vbox1)
+        if vbox2 != None:
+            boxes.append(vbox2)
+            n_color += 1
+
+        if n_color >= target:
+            return
+
+        n_iter += 1
+
+# Quantise an (N, 3) uint8 array of RGB pixels, returns up to color_count (r, g, b)
+# tuples, most dominant first
+def quantize(pixels, color_count):
+    if not len(pixels):
+        raise ValueError("No pixels to quantize.")
+    if color_count < 2 or color_count > 256:
+        raise ValueError("color_count must be between 2 and 256.")
+
+    shifted = pixels.astype(np.intp) >> RSHIFT
+    index = (shifted[:, 0] << (2 * SIGBITS)) | (shifted[:, 1] << SIGBITS) | shifted[:, 2]
+    histo = np.bincount(index, minlength = 1 << (3 * SIGBITS)).reshape((1 << SIGBITS,) * 3)
+
+    low = shifted.min(axis = 0)
+    high = shifted.max(axis = 0)
+    boxes = [_VBox(histo, (int(low[0]), int(high[0]), int(low[1]), int(high[1]), int(low[2]), int(high[2])))]
+
+    # First set of colours split by population, then by population times volume
+    _iterate(histo, boxes, lambda vbox: vbox.count, FRACT_BY_POPULATIONS * color_count)
+
+    # ColorThief moves boxes to the second queue largest first, which decides the order of ties
+    boxes.sort(key = lambda vbox: vbox.count)
+    boxes.reverse()
+    _iterate(histo, boxes, lambda vbox: vbox.count * vbox.volume, color_count - len(boxes))
+
+    palette = []
+    while boxes:
+        palette.append(_pop(boxes, lambda vbox: vbox.count * vbox.volume).avg(histo))
+
+    return palette
+
+# Get the usable pixels of an RGBA array, skipping transparent and near white ones like ColorThief
+def valid_pixels(rgba, quality = 1):
+    pixels = rgba.reshape(-1, 4)[::quality]
+    r, g, b, a = pixels[:, 0], pixels[:, 1], pixels[:, 2], pixels[:, 3]
+    mask = (a >= 125) & ~((r > 250) & (g > 250) & (b > 250))
+
+    return pixels[mask, :3]
+
+# Get a palette of up to color_count colours from an RGBA array, most dominant first
+def get_palette(rgba, color_count = 10, quality = 1):
+    return quantize(valid_pixels(rgba, quality), color_count)
+
+# Get the dominant colour of an RGBA array, same as ColorThief.get_color()
+def get_color(rgba, quality = 1):
+    return get_palette(rgba, 5, quality)[0]
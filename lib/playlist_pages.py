@@ -0,0 +1,120 @@
+import asyncio
+import discord
+
+from lib.cache import TTLCache
+from lib.colors import color_image
+from lib.pages import paginate_lines
+from lib.spotify_embeds import PAGE_LIMIT, playlist_embed, playlist_item_line
+from lib.views import add_page_buttons, pager
+
+# Items per Web API request, and per rendered page
+WINDOW_SIZE = 100
+PAGE_SIZE = 25
+
+# Playlist items are looked up for this market
+MARKET = "GB"
+
+# How long a playlist's rendered pages are kept after they were last loaded
+PAGES_TTL = 3 * 60 * 60
+
+# Render playlist items to pages (lib.pages.Pages), numbering from start
+def render_pages(items, start = 1, page_size = PAGE_SIZE):
+    return paginate_lines([playlist_item_line(i, track) for i, track in enumerate(items, start)], page_size, limit = PAGE_LIMIT)
+
+class PlaylistPages:
+    """Lazily rendered pages of a Spotify playlist.
+
+    Page 1 is rendered from the items that come with the playlist. Later 100 item
+    windows are only fetched when a page in them is viewed, and the neighbouring window
+    is prefetched once the edge of a window is reached. Only rendered page strings are
+    kept, not the API responses."""
+
+    def __init__(self, spotify, playlist, total: int, first_items: tuple, market: str = None):
+        self.spotify = spotify
+        self.playlist = playlist
+        self.total = total
+        self.market = market
+
+        # window index -> rendered pages, or a task while it is being fetched. Each window's
+        # text is stored once and pages are sliced from it when viewed.
+        self._windows = {0: render_pages(first_items)}
+
+    def __len__(self):
+        return max(1, -(-self.total // PAGE_SIZE))
+
+    async def _fetch_window(self, window):
+        offset = window * WINDOW_SIZE
+        items = await self.spotify.playlist_items(self.playlist, market = self.market, offset = offset, limit = WINDOW_SIZE)
+        pages = render_pages(items, start = offset + 1)
+
+        self._windows[window] = pages
+        return pages
+
+    def _start_fetch(self, window):
+        if window not in self._windows and window * WINDOW_SIZE < self.total:
+            task = asyncio.ensure_future(self._fetch_window(window))
+            task.add_done_callback(lambda task: self._fetch_done(window, task))
+            self._windows[window] = task
+
+    # Forget failed fetches, including prefetches nobody awaited, so the next view fetches
+    # the window again instead of getting the old error
+    def _fetch_done(self, window, task):
+        if task.cancelled() or task.exception() != None:
+            if self._windows.get(window) is task:
+                del self._windows[window]
+
+    async def get_page(self, page):
+        window, index = divmod(page * PAGE_SIZE, WINDOW_SIZE)
+        self._start_fetch(window)
+
+        pages = self._windows[window]
+        if isinstance(pages, asyncio.Future):
+            pages = await pages
+
+        # Get the neighbouring window ready in the background when the edge of this one is reached
+        index = index // PAGE_SIZE
+        if index == WINDOW_SIZE // PAGE_SIZE - 1:
+            self._start_fetch(window + 1)
+        elif index == 0 and window > 0:
+            self._start_fetch(window - 1)
+
+        return pages[index] if index < len(pages) else ""
+
+# Rendered pages by playlist ID, shared by every message showing the playlist
+_pages_cache = TTLCache("playlist-pages", maxsize = 256)
+
+async def get_pages(spotify, playlist):
+    pages = _pages_cache.get(playlist.id)
+
+    if pages == None:
+        pages = PlaylistPages(spotify, playlist.id, playlist.total, playlist.items, market = MARKET)
+        _pages_cache.set(playlist.id, pages, PAGES_TTL)
+
+    return pages
+
+# Build the embed and buttons for a page of a playlist, pages out of range wrap around
+async def playlist_message(bot, playlist_id: str, page: int, footer: str, icon_url: str = None):
+    playlist = await bot.spotify.playlist(playlist_id, market = MARKET)
+    pages = await get_pages(bot.spotify, playlist)
+    page %= len(pages)
+
+    # Wait briefly for the cover's colour, a random one is used if it isn't ready. It keeps
+    # being worked out in the background, so later pages get it from the cache.
+    dominant_color = await bot.colors.color_within(color_image(playlist.images).url)
+    color = discord.Color.random() if dominant_color == None else discord.Color.from_rgb(r=dominant_color[0], g=dominant_color[1], b=dominant_color[2])
+
+    embed = playlist_embed(playlist, await pages.get_page(page), color = color)
+    embed.set_footer(text = f"{footer} - Page {page + 1}/{len(pages)}", icon_url = icon_url)
+
+    view = discord.ui.View(timeout = None)
+    view.add_item(discord.ui.Button(label = "Show on Spotify", style = discord.ButtonStyle.url, url = playlist.url))
+    if len(pages) > 1:
+        add_page_buttons(view, "playlist-page", playlist.id, page = page)
+
+    return embed, view
+
+async def _playlist_page(interaction, playlist_id, page):
+    return await playlist_message(interaction.client, playlist_id, page, f"Requested by {interaction.user.name}", interaction.user.avatar.url)
+
+# Registered by TitaniumBot.setup_hook, so both the commands and the autoembed cog can use them
+BUTTON_HANDLERS = {"playlist-page": pager(_playlist_page)}
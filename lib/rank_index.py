@@ -0,0 +1,71 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+
+class RankIndex:
+    """Sorted multiset of numbers that can quickly count how many are above a value.
+
+    Values are kept in sorted buckets of around `bucket_size`, so adding or removing a
+    value only shifts one bucket, and counting only sums the lengths of the buckets after
+    the value's one. With a few hundred thousand values every operation takes microseconds."""
+
+    def __init__(self, values = (), bucket_size: int = 1000):
+        # values must already be sorted, lowest first
+        values = list(values)
+        self.bucket_size = bucket_size
+
+        self._buckets = [values[i:i + bucket_size] for i in range(0, len(values), bucket_size)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(values)
+
+    def __len__(self):
+        return self._len
+
+    def add(self, value):
+        self._len += 1
+
+        if self._buckets == []:
+            self._buckets.append([value])
+            self._maxes.append(value)
+            return
+
+        i = min(bisect_left(self._maxes, value), len(self._maxes) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, value)
+        self._maxes[i] = bucket[-1]
+
+        # Split buckets that have grown too large
+        if len(bucket) > 2 * self.bucket_size:
+            half = bucket[self.bucket_size:]
+            del bucket[self.bucket_size:]
+
+            self._buckets.insert(i + 1, half)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, half[-1])
+
+    def remove(self, value):
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            raise ValueError(f"{value} is not in the index")
+
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, value)
+        if bucket[j] != value:
+            raise ValueError(f"{value} is not in the index")
+
+        del bucket[j]
+        self._len -= 1
+
+        if bucket == []:
+            del self._buckets[i]
+            del self._maxes[i]
+        else:
+            self._maxes[i] = bucket[-1]
+
+    # Number of values greater than value
+    def count_above(self, value):
+        i = bisect_right(self._maxes, value)
+        if i == len(self._maxes):
+            return 0
+
+        bucket = self._buckets[i]
+        return len(bucket) - bisect_right(bucket, value) + sum(map(len, islice(self._buckets, i + 1, None)))
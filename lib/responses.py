@@ -0,0 +1,69 @@
+import asyncio
+import discord
+
+# How long a command can take before its response is deferred, in seconds. Discord
+# needs a response within 3 seconds.
+FAST_BUDGET = 0.5
+
+# Command name -> {"fast": responses sent directly, "slow": responses that were deferred}
+counters = {}
+
+class AdaptiveResponse:
+    """Responds to an interaction, only deferring it when the command is slow.
+
+    Replaces the usual defer() + "Loading..." followup + edit_original_response() pattern.
+    If the first update() comes within the budget it is sent as the interaction response
+    (one request), otherwise the interaction is deferred when the budget runs out and
+    updates edit the deferred response. Later updates always edit the response."""
+
+    def __init__(self, interaction: discord.Interaction, name: str, budget: float = FAST_BUDGET, ephemeral: bool = False):
+        self.interaction = interaction
+        self.name = name
+        self.ephemeral = ephemeral
+
+        # "pending" until the first response, then "deferred" or "responded"
+        self.state = "pending"
+        self._timer = asyncio.ensure_future(self._defer_later(budget))
+
+    async def _defer_later(self, budget):
+        await asyncio.sleep(budget)
+
+        if self.state == "pending":
+            self.state = "deferred"
+            self._count("slow")
+            await self.interaction.response.defer(ephemeral = self.ephemeral)
+
+    def _count(self, path):
+        counters.setdefault(self.name, {"fast": 0, "slow": 0})[path] += 1
+
+    # Show a message as the response, taking the same arguments as edit_original_response()
+    async def update(self, **kwargs):
+        if self.state == "pending":
+            self.state = "responded"
+            self._timer.cancel()
+            self._count("fast")
+
+            # send_message() doesn't accept None for these, and there's nothing to remove yet
+            for key in ("view", "attachments"):
+                if kwargs.get(key, False) in (None, []):
+                    del kwargs[key]
+            if "attachments" in kwargs:
+                kwargs["files"] = kwargs.pop("attachments")
+
+            await self.interaction.response.send_message(ephemeral = self.ephemeral, **kwargs)
+        else:
+            # Make sure the defer has gone through before editing
+            if self.state == "deferred":
+                await asyncio.shield(self._timer)
+
+            await self.interaction.edit_original_response(**kwargs)
+
+# Get fast path counters for all commands, as {name: {"fast", "slow", "fast_rate"}}
+def stats():
+    result = {}
+
+    for name, counts in counters.items():
+        total = counts["fast"] + counts["slow"]
+        result[name] = {**counts, "fast_rate": counts["fast"] / total if total else 0.0}
+
+    return result
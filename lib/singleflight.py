@@ -0,0 +1,32 @@
+import asyncio
+
+class SingleFlight:
+    """Shares one in-flight call between concurrent callers using the same key.
+
+    While a call for a key is running, further calls for that key wait for the
+    same result instead of starting another upstream request."""
+
+    def __init__(self):
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    def _done(self, key, future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+        # Mark the exception as retrieved, in case every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self._calls.get(key)
+
+        if future == None:
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self._calls[key] = future
+            future.add_done_callback(lambda future: self._done(key, future))
+
+        # Shield the shared call, so one caller being cancelled doesn't cancel it for the rest
+        return await asyncio.shield(future)
@@ -0,0 +1,25 @@
+from urllib.parse import quote
+import aiohttp
+
+from lib.singleflight import SingleFlight
+
+API_URL = "https://api.song.link/v1-alpha.1/links"
+
+class SongLinkClient:
+    """song.link API client, shared by all cogs through `bot.songlink`.
+
+    Concurrent lookups of the same URL share one request."""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+        self._flights = SingleFlight()
+
+    async def _lookup(self, url, user_country):
+        processed_source = quote(url, safe='()*!\'')
+
+        async with self.session.get(f"{API_URL}?url={processed_source}&userCountry={user_country}") as request:
+            return request.status, await request.json()
+
+    # Look up a URL, returns (HTTP status, response data)
+    async def lookup(self, url, user_country = "GB"):
+        return await self._flights.do((url, user_country), self._lookup, url, user_country)
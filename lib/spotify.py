@@ -0,0 +1,356 @@
+import asyncio
+import re
+import time
+import aiohttp
+
+from lib.cache import TTLCache, PersistentCache
+from lib.singleflight import SingleFlight
+from lib.spotify_models import Track, Album, Artist, Playlist, playlist_item
+
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+API_URL = "https://api.spotify.com/v1"
+
+# Matches open.spotify.com URLs (including intl-xx paths) and spotify: URIs
+_url_regex = re.compile(r"^(?:https?://)?open\.spotify\.com/(?:intl-\w+/)?(?P<type>track|artist|album|playlist|show|episode|user)/(?P<id>[0-9A-Za-z]+)")
+_uri_regex = re.compile(r"^spotify:(?P<type>track|artist|album|playlist|show|episode|user):(?P<id>[0-9A-Za-z]+)$")
+_id_regex = re.compile(r"^[0-9A-Za-z]+$")
+
+# Cache lifetimes in seconds for each entity type
+CACHE_TTLS = {
+    "track": 24 * 3600,
+    "album": 12 * 3600,
+    "artist": 3600,
+    "top-tracks": 6 * 3600,
+    "playlist": 600,
+}
+
+# Fields used when listing playlists, so only what is shown is downloaded and cached
+PLAYLIST_ITEM_FIELDS = "items(track(name,type,artists(name),album(name)))"
+PLAYLIST_FIELDS = f"id,name,owner(display_name),external_urls,images,tracks(total,{PLAYLIST_ITEM_FIELDS})"
+
+# How long to remember that an ID doesn't exist
+NOT_FOUND_TTL = 600
+
+# How long stale entries on disk can be served while they are refreshed
+STALE_TTL = 7 * 24 * 3600
+
+# How long stale entries are kept in memory while they are refreshed
+REVALIDATE_TTL = 60
+
+# Cached in place of entities that returned 404
+NOT_FOUND = object()
+
+# Parse Web API or cached JSON into models
+def _parse(type, data):
+    if type == "top-tracks":
+        return tuple(Track.from_json(track) for track in data["tracks"])
+
+    return {"track": Track, "album": Album, "artist": Artist, "playlist": Playlist}[type].from_json(data)
+
+# Convert models back to JSON for the disk cache
+def _dump(value):
+    if isinstance(value, tuple):
+        return {"tracks": [track.to_json() for track in value]}
+
+    return value.to_json()
+
+class SpotifyError(Exception):
+    def __init__(self, http_status, msg):
+        super().__init__(f"HTTP {http_status}: {msg}")
+        self.http_status = http_status
+        self.msg = msg
+
+# Get a Spotify ID from a URL, URI or bare ID
+def get_id(type, value):
+    value = value.strip()
+
+    for regex in (_url_regex, _uri_regex):
+        match = regex.match(value)
+        if match != None:
+            if match.group("type") != type:
+                raise SpotifyError(400, f"Expected a {type} link, got a {match.group('type')} link.")
+            return match.group("id")
+
+    if _id_regex.match(value):
+        return value
+
+    raise SpotifyError(400, f"Unsupported {type} URL or ID.")
+
+class _Batcher:
+    """Collects single ID lookups for a short window, then sends them as bulk requests.
+
+    Lookups from one message, or from several messages arriving close together,
+    are combined into as few requests as possible."""
+
+    def __init__(self, client, path: str, max_ids: int, window: float):
+        self.client = client
+        self.path = path
+        self.max_ids = max_ids
+        self.window = window
+
+        # market -> {id: future}
+        self._pending = {}
+        self._handle = None
+
+    # Queue an ID, returns a future for its result
+    def get(self, id, market = None):
+        loop = asyncio.get_running_loop()
+        ids = self._pending.setdefault(market, {})
+
+        future = ids.get(id)
+        if future == None:
+            future = loop.create_future()
+            ids[id] = future
+
+        # Send straight away if the batch is full, else wait for more IDs
+        if len(ids) >= self.max_ids:
+            del self._pending[market]
+            self.client._background(self._send(list(ids.items()), market))
+        elif self._handle == None:
+            self._handle = loop.call_later(self.window, self._flush)
+
+        return future
+
+    def _flush(self):
+        self._handle = None
+        pending, self._pending = self._pending, {}
+
+        for market, ids in pending.items():
+            self.client._background(self._send(list(ids.items()), market))
+
+    async def _send(self, items, market):
+        try:
+            data = await self.client._get(self.path, ids = ",".join(id for id, future in items), market = market)
+
+            # Results are returned in request order, with null for unknown IDs
+            results = data[self.path]
+
+            for index, (id, future) in enumerate(items):
+                result = results[index] if index < len(results) else None
+
+                if future.done():
+                    continue
+                elif result == None:
+                    future.set_exception(SpotifyError(404, "Resource not found."))
+                else:
+                    future.set_result(result)
+        except Exception as error:
+            # Includes responses in an unexpected shape, every waiting lookup gets the error
+            for id, future in items:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            # Never leave a lookup waiting, e.g. if this task was cancelled
+            for id, future in items:
+                if not future.done():
+                    future.cancel()
+
+class SpotifyClient:
+    """Asynchronous Spotify Web API client, shared by all cogs through `bot.spotify`.
+
+    Requests go through the bot's pooled aiohttp session, and a single client credentials
+    token is shared between every caller and refreshed shortly before it expires.
+
+    Tracks, albums, artists and playlists are cached by their Spotify ID, so different
+    URLs for the same item (tracking parameters, intl-xx paths) share a cache entry.
+    When `cache_path` is given, entries are also kept on disk so they survive restarts;
+    stale disk entries are served straight away and refreshed in the background."""
+
+    def __init__(self, session: aiohttp.ClientSession, client_id: str, client_secret: str, cache_size: int = 2048, cache_path: str = None, batch_window: float = 0.025):
+        self.session = session
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.cache = TTLCache("spotify", maxsize = cache_size)
+
+        if cache_path != None:
+            self.disk_cache = PersistentCache(cache_path)
+            self.disk_cache.prune(STALE_TTL)
+        else:
+            self.disk_cache = None
+
+        # Background revalidation and disk write tasks
+        self._tasks = set()
+        self._revalidating = set()
+        self._flights = SingleFlight()
+
+        # Bulk lookup batchers, limits from the Web API docs
+        self._batchers = {
+            "track": _Batcher(self, "tracks", 50, batch_window),
+            "album": _Batcher(self, "albums", 20, batch_window),
+            "artist": _Batcher(self, "artists", 50, batch_window),
+        }
+
+        self._token = None
+        self._token_expires = 0
+        self._token_lock = asyncio.Lock()
+
+    # Get access token, refreshing it if needed
+    async def _get_token(self):
+        async with self._token_lock:
+            if self._token == None or time.monotonic() > self._token_expires - 60:
+                auth = aiohttp.BasicAuth(self.client_id, self.client_secret)
+                async with self.session.post(TOKEN_URL, data = {"grant_type": "client_credentials"}, auth = auth) as request:
+                    if request.status != 200:
+                        raise SpotifyError(request.status, "Could not get an access token. Are the Spotify API keys valid?")
+                    data = await request.json()
+
+                self._token = data["access_token"]
+                self._token_expires = time.monotonic() + data["expires_in"]
+
+            return self._token
+
+    # Send GET request to the Web API
+    async def _get(self, path, **params):
+        params = {key: str(value) for key, value in params.items() if value != None}
+
+        # Retry on expired token or rate limit
+        for attempt in range(3):
+            token = await self._get_token()
+
+            async with self.session.get(f"{API_URL}/{path}", params = params, headers = {"Authorization": f"Bearer {token}"}) as request:
+                if request.status == 401:
+                    self._token = None
+                    continue
+                elif request.status == 429:
+                    retry_after = int(request.headers.get("Retry-After", 1))
+
+                    # Don't hold a command for longer than Discord will wait
+                    if retry_after > 10:
+                        raise SpotifyError(429, f"Rate limited for {retry_after} seconds.")
+
+                    await asyncio.sleep(retry_after)
+                    continue
+                elif request.status >= 400:
+                    try:
+                        msg = (await request.json())["error"]["message"]
+                    except Exception:
+                        msg = request.reason
+                    raise SpotifyError(request.status, msg)
+
+                return await request.json()
+
+        raise SpotifyError(429, "Request failed after retrying.")
+
+    # Run a coroutine in the background, keeping a reference until it finishes
+    def _background(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # Fetch an entity from the Web API and store it in both cache tiers
+    async def _fetch(self, type, id, key, path, market = None, **params):
+        try:
+            # Single lookups of the same type are combined into bulk requests where possible
+            if type in self._batchers and not params and len(id) == 22:
+                result = await asyncio.shield(self._batchers[type].get(id, market))
+            else:
+                result = await self._get(path, market = market, **params)
+        except SpotifyError as error:
+            if error.http_status == 404:
+                self.cache.set(key, NOT_FOUND, NOT_FOUND_TTL)
+            raise
+
+        result = _parse(type, result)
+        self.cache.set(key, result, CACHE_TTLS[type])
+
+        if self.disk_cache != None:
+            self._background(self.disk_cache.set(key, _dump(result)))
+
+        return result
+
+    # Refresh a stale entry without holding up the caller
+    async def _revalidate(self, type, id, key, path, **params):
+        try:
+            await self._fetch(type, id, key, path, **params)
+        except Exception as error:
+            print(f"[SPOTIFY] Failed to refresh {key} in the background.")
+            print(error)
+        finally:
+            self._revalidating.discard(key)
+
+    # Get an entity from the cache, or from the Web API if it isn't cached
+    async def _get_cached(self, type, id, path, market = None, **params):
+        key = f"{type}:{id}" if market == None else f"{type}:{id}:{market}"
+
+        result = self.cache.get(key)
+        if result is NOT_FOUND:
+            raise SpotifyError(404, "Resource not found.")
+        elif result != None:
+            return result
+
+        # Concurrent misses for the same key share one lookup
+        return await self._flights.do(key, self._load, type, id, key, path, market = market, **params)
+
+    # Get an entity that isn't in the memory cache, from disk or from the Web API
+    async def _load(self, type, id, key, path, market = None, **params):
+        # Check the disk cache
+        if self.disk_cache != None:
+            stored = await self.disk_cache.get(key)
+
+            if stored != None:
+                data, fetched_at = stored
+                result = _parse(type, data)
+                age = time.time() - fetched_at
+
+                if age < CACHE_TTLS[type]:
+                    self.cache.set(key, result, CACHE_TTLS[type] - age)
+                    return result
+                elif age < STALE_TTL:
+                    # Serve the stale entry and refresh it in the background
+                    self.cache.set(key, result, REVALIDATE_TTL)
+
+                    if key not in self._revalidating:
+                        self._revalidating.add(key)
+                        self._background(self._revalidate(type, id, key, path, market = market, **params))
+
+                    return result
+
+        return await self._fetch(type, id, key, path, market = market, **params)
+
+    # Wait for background tasks and close the disk cache
+    async def close(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions = True)
+
+        if self.disk_cache != None:
+            self.disk_cache.close()
+
+    async def track(self, track, market = None):
+        id = get_id("track", track)
+        return await self._get_cached("track", id, f"tracks/{id}", market = market)
+
+    async def album(self, album, market = None):
+        id = get_id("album", album)
+        return await self._get_cached("album", id, f"albums/{id}", market = market)
+
+    async def artist(self, artist):
+        id = get_id("artist", artist)
+        return await self._get_cached("artist", id, f"artists/{id}")
+
+    async def artist_top_tracks(self, artist, country = "US"):
+        id = get_id("artist", artist)
+        return await self._get_cached("top-tracks", id, f"artists/{id}/top-tracks", country = country)
+
+    # Get several entities at once, results are in the same order as the input
+    async def tracks(self, tracks, market = None):
+        return await asyncio.gather(*(self.track(track, market = market) for track in tracks))
+
+    async def albums(self, albums, market = None):
+        return await asyncio.gather(*(self.album(album, market = market) for album in albums))
+
+    async def artists(self, artists):
+        return await asyncio.gather(*(self.artist(artist) for artist in artists))
+
+    async def playlist(self, playlist, market = None):
+        id = get_id("playlist", playlist)
+        return await self._get_cached("playlist", id, f"playlists/{id}", market = market, fields = PLAYLIST_FIELDS, additional_types = "track,episode")
+
+    # Get a page of playlist items, unavailable items are None
+    async def playlist_items(self, playlist, market = None, offset = 0, limit = 100, fields = PLAYLIST_ITEM_FIELDS):
+        result = await self._get(f"playlists/{get_id('playlist', playlist)}/tracks", market = market, offset = offset, limit = limit, fields = fields, additional_types = "track,episode")
+        return tuple(playlist_item(item) for item in result["items"])
+
+    # Search for tracks, artists or albums, returns a tuple of models
+    async def search(self, q, type = "track", limit = 10, market = None):
+        result = await self._get("search", q = q, type = type, limit = limit, market = market)
+        return tuple(_parse(type, item) for item in result[f"{type}s"]["items"])
@@ -0,0 +1,174 @@
+import discord
+
+# Builds the embeds shared by the Spotify commands and the autoembed cog from the
+# Spotify models. Lists are built as lists of lines and joined once, and every text
+# is cut to Discord's limits while it is built, so long albums and playlists can't
+# make a message fail to send.
+
+# Discord limits, in characters
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FIELD_VALUE_LIMIT = 1024
+OPTION_LIMIT = 100
+
+# Leaves room in playlist descriptions for the "by owner - N items" header
+PAGE_LIMIT = DESCRIPTION_LIMIT - 256
+
+# Colour used until the dominant colour of the artwork is ready
+PLACEHOLDER_COLOR = discord.Color.from_rgb(r = 255, g = 255, b = 255)
+
+# Cut text to the limit, marking that it was cut with "..."
+def clip(text, limit):
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+# Stop * in names from breaking the bold markdown around them
+def escape(text):
+    return text.replace("*", "-")
+
+# Comma separated artist names, e.g. "artist1, artist2, artist3"
+def artist_names(artists):
+    return ", ".join([artist.name for artist in artists])
+
+# Song length as mm:ss
+def duration(ms):
+    minutes, seconds = divmod(ms // 1000, 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+# Join lines with newlines, keeping as many as fit in limit characters. If some don't fit,
+# the last line says how many were left out.
+def join_lines(lines, limit):
+    # Most lists fit, check that with one pass in C before going line by line
+    if sum(map(len, lines)) + len(lines) - 1 <= limit:
+        return "\n".join(lines)
+
+    kept = []
+    length = 0
+
+    for line in lines:
+        added = len(line) + (1 if kept else 0)
+        if length + added > limit:
+            break
+
+        kept.append(line)
+        length += added
+    else:
+        return "\n".join(kept)
+
+    # Drop lines until the note fits
+    note = f"*+{len(lines) - len(kept)} more*"
+    while kept and length + 1 + len(note) > limit:
+        line = kept.pop()
+        length -= len(line) + (1 if kept else 0)
+        note = f"*+{len(lines) - len(kept)} more*"
+
+    kept.append(note)
+    return "\n".join(kept)
+
+# "1. **Song** - Artists", the artists are left out for songs by a single artist if hide_single_artist is set
+def track_line(number, track, hide_single_artist = True):
+    if hide_single_artist and len(track.artists) == 1:
+        return f"{number}. **{escape(track.name)}**"
+
+    return f"{number}. **{escape(track.name)}** - {escape(artist_names(track.artists))}"
+
+# Line for a playlist item, which can be a song, a podcast episode or unavailable (None)
+def playlist_item_line(number, track):
+    if track == None:
+        # Item type is unavailable in the GB reigon
+        return f"{number}. *(Media Unavailable)*"
+    elif track.type == "track":
+        # Same as track_line(), written out as playlists can have thousands of items
+        return f"{number}. **{escape(track.name)}** - {escape(artist_names(track.artists))}"
+    elif track.type == "episode" and track.album != None:
+        return f"{number}. **{escape(track.album.name)}** - {escape(track.name)} (Podcast)"
+    else:
+        # Item type is unknown / unsupported
+        return f"{number}. *(Unknown Media Type)*"
+
+def _title(text, label):
+    return clip(text if label == None else f"{text} ({label})", TITLE_LIMIT)
+
+# Song embed with artist and album fields. label is added to the title, e.g. "Song".
+def track_embed(track, inline = False, label: str = None, color = None):
+    title = f"{track.name} (Explicit)" if track.explicit else track.name
+
+    embed = discord.Embed(title = _title(title, label), color = color)
+    embed.add_field(name = "Artists", value = clip(artist_names(track.artists), FIELD_VALUE_LIMIT), inline = inline)
+    embed.add_field(name = "Album", value = clip(track.album.name, FIELD_VALUE_LIMIT), inline = inline)
+    embed.set_thumbnail(url = track.album.images[0].url)
+
+    return embed
+
+# Artist embed with followers and up to 5 top songs
+def artist_embed(artist, top_tracks, label: str = None, color = None):
+    top_songs = join_lines([track_line(i, track) for i, track in enumerate(top_tracks[:5], 1)], FIELD_VALUE_LIMIT)
+
+    embed = discord.Embed(title = _title(artist.name, label), color = color)
+    embed.add_field(name = "Followers", value = f"{artist.followers:,}" if artist.followers != None else "Unknown", inline = False)
+    embed.add_field(name = "Top Songs", value = top_songs or "No top songs.", inline = False)
+    embed.set_thumbnail(url = artist.images[0].url)
+
+    return embed
+
+# Album embed with the track list as the description
+def album_embed(album, label: str = None, color = None):
+    songs = join_lines([track_line(i, track) for i, track in enumerate(album.tracks, 1)], DESCRIPTION_LIMIT)
+
+    embed = discord.Embed(title = _title(f"{album.name} - {artist_names(album.artists)}", label), description = songs, color = color)
+    embed.set_thumbnail(url = album.images[0].url)
+
+    return embed
+
+# Playlist embed showing one page of items, pages come from lib.playlist_pages.render_pages()
+def playlist_embed(playlist, page, color = None):
+    description = clip(f"by {playlist.owner_name} - {playlist.total} items\n\n{page}", DESCRIPTION_LIMIT)
+
+    embed = discord.Embed(title = _title(playlist.name, "Playlist"), description = description, color = color)
+    embed.set_thumbnail(url = playlist.images[0].url)
+
+    return embed
+
+# Embed showing an image at full size, with its resolution when known
+def art_embed(title, image, color = None):
+    if image.width == None or image.height == None:
+        description = "Viewing highest quality (Resolution unknown)"
+    else:
+        description = f"Viewing highest quality ({image.width}x{image.height})"
+
+    embed = discord.Embed(title = clip(title, TITLE_LIMIT), description = description, color = color)
+    embed.set_image(url = image.url)
+
+    return embed
+
+# Search result options for select menus
+def track_option(index, track):
+    if track.explicit:
+        label = clip(track.name, OPTION_LIMIT - len(" (Explicit)")) + " (Explicit)"
+    else:
+        label = clip(track.name, OPTION_LIMIT)
+
+    return discord.SelectOption(label = label, description = clip(f"{artist_names(track.artists)} - {track.album.name}", OPTION_LIMIT), value = index)
+
+def artist_option(index, artist):
+    return discord.SelectOption(label = clip(artist.name, OPTION_LIMIT), value = index)
+
+def album_option(index, album):
+    return discord.SelectOption(label = clip(album.name, OPTION_LIMIT), description = clip(escape(artist_names(album.artists)), OPTION_LIMIT), value = index)
+
+# Send an embed in the dominant colour of the image at image_url, with footer. send(embed) is
+# an async function that sends or edits the message. The colour is waited for up to the
+# colour service's deadline, so the embed is usually sent once. If it takes longer, the embed
+# is sent in the placeholder colour first and sent again once the colour is ready.
+async def send_with_color(colors, embed, image_url, send, footer: str, icon_url: str = None):
+    color = await colors.color_within(image_url)
+
+    if color == None:
+        embed.color = PLACEHOLDER_COLOR
+        embed.set_footer(text = "Getting colour information...")
+        await send(embed)
+
+        color = await colors.dominant_color(image_url)
+
+    embed.set_footer(text = footer, icon_url = icon_url)
+    embed.color = discord.Color.from_rgb(r = color[0], g = color[1], b = color[2])
+    await send(embed)
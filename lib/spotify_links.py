@@ -0,0 +1,102 @@
+from urllib.parse import urljoin
+from typing import NamedTuple
+import re
+import aiohttp
+
+from lib.cache import TTLCache, PersistentCache
+from lib.singleflight import SingleFlight
+from lib.spotify import SpotifyError
+
+SHORT_LINK_URL = "https://spotify.link/"
+MAX_REDIRECTS = 5
+
+# How long expanded short links stay in memory, they never change
+LINK_TTL = 30 * 24 * 60 * 60
+
+# Matches open.spotify.com links (including intl-xx paths) and spotify.link short links.
+# The pattern starts with a literal and has no lookbehind, so the regex engine can skip
+# ahead quickly over text that isn't a link.
+_link_regex = re.compile(
+    r"open\.spotify\.com/(?:intl-[A-Za-z-]+/)?(track|artist|album|playlist)/([0-9A-Za-z]+)"
+    r"|spotify\.link/([0-9A-Za-z]+)"
+)
+
+class SpotifyLink(NamedTuple):
+    # "track", "artist", "album" or "playlist", or "short" for spotify.link short links
+    type: str
+    # Spotify ID, or the short code for spotify.link short links
+    id: str
+
+# Get all Spotify links in a message, in the order they appear
+def extract_links(text):
+    # Most messages don't mention Spotify at all, skip running the regex for them
+    if "spotify" not in text:
+        return []
+
+    return [SpotifyLink(type, id) if type else SpotifyLink("short", code) for type, id, code in _link_regex.findall(text)]
+
+class ShortLinkResolver:
+    """Expands spotify.link short links, shared by all cogs through `bot.spotify_links`.
+
+    Only the redirect headers are read, using the shared session. A short code always
+    points at the same link, so expanded links are kept in memory and on disk."""
+
+    def __init__(self, session: aiohttp.ClientSession, cache_path: str = None, cache_size: int = 4096):
+        self.session = session
+        self.cache = TTLCache("spotify-links", maxsize = cache_size)
+        self.disk_cache = PersistentCache(cache_path) if cache_path != None else None
+        self._flights = SingleFlight()
+
+    # Follow redirects from the short link until they reach an open.spotify.com link
+    async def _expand(self, code):
+        url = f"{SHORT_LINK_URL}{code}"
+
+        for i in range(MAX_REDIRECTS):
+            async with self.session.get(url, allow_redirects = False) as request:
+                location = request.headers.get("Location")
+
+            if location == None:
+                break
+
+            url = urljoin(url, location)
+            links = extract_links(url)
+            if links and links[0].type != "short":
+                return f"https://open.spotify.com/{links[0].type}/{links[0].id}"
+
+        raise SpotifyError(404, "Short link could not be expanded.")
+
+    async def _resolve(self, code):
+        url = None
+
+        if self.disk_cache != None:
+            stored = await self.disk_cache.get(code)
+            if stored != None:
+                url = stored[0]
+
+        if url == None:
+            url = await self._expand(code)
+
+            if self.disk_cache != None:
+                await self.disk_cache.set(code, url)
+
+        self.cache.set(code, url, LINK_TTL)
+        return url
+
+    # Expand a spotify.link URL to an open.spotify.com URL, other Spotify links are returned as is
+    async def resolve(self, url):
+        links = extract_links(url)
+        if not links:
+            raise SpotifyError(400, "Not a Spotify link.")
+        if links[0].type != "short":
+            return url
+
+        code = links[0].id
+        expanded = self.cache.get(code)
+        if expanded != None:
+            return expanded
+
+        return await self._flights.do(code, self._resolve, code)
+
+    def close(self):
+        if self.disk_cache != None:
+            self.disk_cache.close()
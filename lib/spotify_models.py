@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# Compact models for Spotify entities. Only fields the bot uses are kept, so cached
+# entities and open views don't hold full Web API responses. to_json() writes the
+# same shape as the Web API, so from_json() reads both API responses and cached data.
+
+def _url(data):
+    return (data.get("external_urls") or {}).get("spotify", "")
+
+@dataclass(frozen = True, slots = True)
+class Image:
+    url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["url"], data.get("width"), data.get("height"))
+
+    def to_json(self):
+        return {"url": self.url, "width": self.width, "height": self.height}
+
+def _images(data):
+    return tuple(Image.from_json(image) for image in data.get("images") or ())
+
+@dataclass(frozen = True, slots = True)
+class Artist:
+    id: str
+    name: str
+    url: str = ""
+    followers: Optional[int] = None
+    images: tuple = ()
+
+    @classmethod
+    def from_json(cls, data):
+        followers = data.get("followers")
+        return cls(data.get("id") or "", data["name"], _url(data), followers["total"] if followers else None, _images(data))
+
+    def to_json(self):
+        data = {"id": self.id, "name": self.name, "external_urls": {"spotify": self.url}}
+
+        if self.followers != None:
+            data["followers"] = {"total": self.followers}
+        if self.images:
+            data["images"] = [image.to_json() for image in self.images]
+
+        return data
+
+def _artists(data):
+    return tuple(Artist.from_json(artist) for artist in data.get("artists") or ())
+
+@dataclass(frozen = True, slots = True)
+class Track:
+    id: str
+    name: str
+    url: str = ""
+    type: str = "track"
+    explicit: bool = False
+    duration_ms: int = 0
+    artists: tuple = ()
+    album: Optional["Album"] = None
+
+    @classmethod
+    def from_json(cls, data):
+        album = Album.from_json(data["album"]) if data.get("album") else None
+        return cls(data.get("id") or "", data["name"], _url(data), data.get("type", "track"), data.get("explicit", False), data.get("duration_ms", 0), _artists(data), album)
+
+    def to_json(self):
+        data = {"id": self.id, "name": self.name, "type": self.type, "explicit": self.explicit, "duration_ms": self.duration_ms, "external_urls": {"spotify": self.url}, "artists": [artist.to_json() for artist in self.artists]}
+
+        if self.album != None:
+            data["album"] = self.album.to_json()
+
+        return data
+
+@dataclass(frozen = True, slots = True)
+class Album:
+    id: str
+    name: str
+    url: str = ""
+    artists: tuple = ()
+    images: tuple = ()
+    tracks: tuple = ()
+
+    @classmethod
+    def from_json(cls, data):
+        tracks = tuple(Track.from_json(track) for track in (data.get("tracks") or {}).get("items") or ())
+        return cls(data.get("id") or "", data["name"], _url(data), _artists(data), _images(data), tracks)
+
+    def to_json(self):
+        data = {"id": self.id, "name": self.name, "external_urls": {"spotify": self.url}, "artists": [artist.to_json() for artist in self.artists], "images": [image.to_json() for image in self.images]}
+
+        if self.tracks:
+            data["tracks"] = {"items": [track.to_json() for track in self.tracks]}
+
+        return data
+
+# Parse a playlist item, returns None for items that are unavailable
+def playlist_item(data):
+    return Track.from_json(data["track"]) if data.get("track") else None
+
+@dataclass(frozen = True, slots = True)
+class Playlist:
+    id: str
+    name: str
+    url: str = ""
+    owner_name: str = ""
+    images: tuple = ()
+    total: int = 0
+    items: tuple = ()
+
+    @classmethod
+    def from_json(cls, data):
+        tracks = data.get("tracks") or {}
+        items = tuple(playlist_item(item) for item in tracks.get("items") or ())
+        return cls(data.get("id") or "", data["name"], _url(data), (data.get("owner") or {}).get("display_name") or "", _images(data), tracks.get("total", len(items)), items)
+
+    def to_json(self):
+        return {"id": self.id, "name": self.name, "external_urls": {"spotify": self.url}, "owner": {"display_name": self.owner_name}, "images": [image.to_json() for image in self.images], "tracks": {"total": self.total, "items": [{"track": None if item == None else item.to_json()} for item in self.items]}}
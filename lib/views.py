@@ -0,0 +1,86 @@
+import discord
+from discord import Color
+
+# Buttons that keep working across restarts and cog reloads. Everything a button needs
+# is stored in its custom_id as "ti:<handler>:<arg>:<arg>...", and presses are sent to
+# the handler registered under that name in `bot.button_handlers`, which rebuilds the
+# message from the caches. No view objects are kept per message.
+
+PREFIX = "ti"
+
+# Discord's custom_id length limit
+CUSTOM_ID_LIMIT = 100
+
+def custom_id(name, *args):
+    value = ":".join((PREFIX, name, *map(str, args)))
+    if len(value) > CUSTOM_ID_LIMIT:
+        raise ValueError(f"custom_id is longer than {CUSTOM_ID_LIMIT} characters: {value}")
+
+    return value
+
+class ActionButton(discord.ui.DynamicItem[discord.ui.Button], template = rf"{PREFIX}:(?P<name>[\w-]+)(?P<args>(?::[^:]*)*)"):
+    """Button that calls the handler registered in `bot.button_handlers` under `name` with
+    the interaction and `args` (as strings). Registered once in `TitaniumBot.setup_hook`."""
+
+    def __init__(self, name: str, *args, label: str = None, style: discord.ButtonStyle = discord.ButtonStyle.gray, row: int = None):
+        self.name = name
+        self.args = tuple(str(arg) for arg in args)
+        super().__init__(discord.ui.Button(label = label, style = style, row = row, custom_id = custom_id(name, *self.args)))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        args = match["args"].split(":")[1:]
+        return cls(match["name"], *args, label = item.label, style = item.style, row = item.row)
+
+    async def callback(self, interaction: discord.Interaction):
+        handler = getattr(interaction.client, "button_handlers", {}).get(self.name)
+
+        if handler == None:
+            # The cog handling this button isn't loaded
+            embed = discord.Embed(title = "This button is unavailable right now.", description = "Please try again later.", color = Color.red())
+            await interaction.response.send_message(embed = embed, ephemeral = True)
+            return
+
+        await handler(interaction, *self.args)
+
+# Register button handlers for a cog, call from cog_load(). handlers is {name: async handler(interaction, *args)}.
+def register(bot, handlers: dict):
+    bot.button_handlers.update(handlers)
+
+# Remove a cog's button handlers, call from cog_unload()
+def unregister(bot, handlers: dict):
+    for name in handlers:
+        bot.button_handlers.pop(name, None)
+
+# Wrap a page renderer as a button handler. render(interaction, *args, page) returns
+# (embed, view) for the page, and wraps page numbers that are out of range. Rendering can
+# fetch from upstream, so the press is deferred first to stay within Discord's 3 seconds.
+def pager(render):
+    async def handler(interaction: discord.Interaction, *args):
+        *args, page, step = args
+        await interaction.response.defer()
+
+        embed, view = await render(interaction, *args, int(page) + int(step))
+        await interaction.edit_original_response(embed = embed, view = view)
+
+    return handler
+
+# Add previous and next buttons for a pager handler, the current page is stored in their custom_ids
+def add_page_buttons(view: discord.ui.View, name: str, *args, page: int, row: int = None):
+    view.add_item(ActionButton(name, *args, page, -1, label = "<", style = discord.ButtonStyle.green, row = row))
+    view.add_item(ActionButton(name, *args, page, 1, label = ">", style = discord.ButtonStyle.green, row = row))
+
+# Button that deletes its message. If user_id is given, only that user can use it.
+def dismiss_button(user_id: int = 0, label: str = "Close", row: int = None):
+    return ActionButton("dismiss", user_id, label = label, style = discord.ButtonStyle.red, row = row)
+
+async def _dismiss(interaction: discord.Interaction, user_id):
+    if user_id == "0" or interaction.user.id == int(user_id):
+        await interaction.response.defer()
+        await interaction.message.delete()
+    else:
+        embed = discord.Embed(title = "Error", description = f"{interaction.user.mention}, you are not the message OP.", color = Color.red())
+        await interaction.response.send_message(embed = embed, ephemeral = True)
+
+# Handlers that don't belong to a cog
+BUILTIN_HANDLERS = {"dismiss": _dismiss}
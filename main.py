@@ -7,24 +7,16 @@ from discord.ext import commands
 from discord import Color
 import os
 import asyncio
+import aiohttp
 import logging
 
-print("Welcome to TitaniumCore.")
-print("https://github.com/restartb/titaniumcore\n")
-
-# Current Running Path
-path = os.getcwd()
-
-# Logging handler
-handler = logging.FileHandler(filename='discord_critical.log', encoding='utf-8', mode='w')
-
-# Set path type
-if f"{os.name}" == "nt":
-    pathtype = "\\"
-    print(f"[INIT] OS name is {os.name}, path type {pathtype}\n")
-else:
-    pathtype = "/"
-    print(f"[INIT] OS name is {os.name}, path type {pathtype}\n")
+from lib.spotify import SpotifyClient
+from lib.spotify_links import ShortLinkResolver
+from lib.songlink import SongLinkClient
+from lib.images import ImageFetcher
+from lib.colors import ColorService
+from lib.views import ActionButton, BUILTIN_HANDLERS
+from lib.playlist_pages import BUTTON_HANDLERS as PLAYLIST_BUTTON_HANDLERS
 
 # ------ Config File Reader ------
 def readconfigfile(path):
@@ -52,130 +44,196 @@ def readconfigfile(path):
         exit()
 
 # Bot Setup
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-bot = commands.Bot(intents = intents, command_prefix = '')
-
-print("[INIT] Reading config files.")
-
-# Read config files
-readconfigfile('config.cfg')
-
-# Config File Vars
-try:
-    bot.path = path
-    bot.pathtype = pathtype
-
-    bot.token = tokens_dict['discord-bot-token']
-    bot.spotify_id = tokens_dict['spotify-api-id']
-    bot.spotify_secret = tokens_dict['spotify-api-secret']
-    
-    bot.dev_ids_str = options_dict['owner-ids'].split(",")
-    bot.support_server = options_dict['support-server']
-    bot.cog_blacklist = options_dict['cog-blacklist']
-    # bot.blocked_ids_str = options_dict['user-blacklist'].split(",")
-
-    if options_dict['cog-dir'] == '':
-        bot.cog_dir = f"{path}{pathtype}commands{pathtype}"
+class TitaniumBot(commands.Bot):
+    # Create shared services before any cogs are loaded
+    async def setup_hook(self):
+        # Pooled HTTP session shared by all cogs
+        self.session = aiohttp.ClientSession(connector = aiohttp.TCPConnector(limit = 100, ttl_dns_cache = 300), timeout = aiohttp.ClientTimeout(total = 30))
+        
+        # Shared Spotify client, with its cache stored in the content folder
+        os.makedirs(f"{self.path}{self.pathtype}content{self.pathtype}sql", exist_ok = True)
+        self.spotify = SpotifyClient(self.session, self.spotify_id, self.spotify_secret, cache_path = f"{self.path}{self.pathtype}content{self.pathtype}sql{self.pathtype}spotify_cache.db")
+
+        # Shared spotify.link expander, with expanded links stored in the content folder
+        self.spotify_links = ShortLinkResolver(self.session, cache_path = f"{self.path}{self.pathtype}content{self.pathtype}sql{self.pathtype}spotify_links.db")
+
+        # Shared song.link client and image downloader
+        self.songlink = SongLinkClient(self.session)
+        self.images = ImageFetcher(self.session)
+
+        # Shared dominant colour finder, quantising images in worker processes and storing colours in the content folder
+        self.colors = ColorService(self.images, cache_path = f"{self.path}{self.pathtype}content{self.pathtype}sql{self.pathtype}colors.db", deadline = self.color_deadline)
+
+        # Persistent buttons, their state is in their custom_id and cogs add their handlers when loaded
+        self.button_handlers = {**BUILTIN_HANDLERS, **PLAYLIST_BUTTON_HANDLERS}
+        self.add_dynamic_items(ActionButton)
+
+    # Close shared services on shutdown
+    async def close(self):
+        await super().close()
+
+        if hasattr(self, "spotify"):
+            await self.spotify.close()
+
+        if hasattr(self, "spotify_links"):
+            self.spotify_links.close()
+
+        if hasattr(self, "colors"):
+            self.colors.close()
+
+        if hasattr(self, "session"):
+            await self.session.close()
+
+# Only start the bot when run directly. Colour worker processes (lib/colors.py) import this
+# file as __mp_main__, and must not read the config or start another bot.
+if __name__ == "__main__":
+    print("Welcome to TitaniumCore.")
+    print("https://github.com/restartb/titaniumcore\n")
+
+    # Current Running Path
+    path = os.getcwd()
+
+    # Logging handler
+    handler = logging.FileHandler(filename='discord_critical.log', encoding='utf-8', mode='w')
+
+    # Set path type
+    if f"{os.name}" == "nt":
+        pathtype = "\\"
+        print(f"[INIT] OS name is {os.name}, path type {pathtype}\n")
     else:
-        bot.cog_dir = options_dict['cog-dir']
-    
-    if options_dict['sync-on-start'] == 'True':
-        bot.sync_on_start = True
-    else:
-        bot.sync_on_start = False
-
-    # Convert Dev IDs from str to int
-    bot.dev_ids = []
-    for id in bot.dev_ids_str:
-        bot.dev_ids.append(int(id))
-
-    ## Convert Dev IDs from str to int
-    # bot.blocked_ids = []
-    # for id in bot.blocked_ids_str:
-        # bot.blocked_ids.append(int(id))
-    
-    print("[INIT] Config files read.\n")
-except Exception as error:
-    print("[INIT] Bad value in config file! Exiting.")
-    print(error)
-    exit()
-
-# Sync bot cogs when started
-@bot.event
-async def on_ready():
-    # support_invite = await bot.fetch_invite(bot.support_server)
-    # control_server = support_invite.guild
-    # bot.control_server_id = control_server.id
-    
-    print("[INIT] Loading cogs...")
-    # Find all cogs in command dir
-    for filename in os.listdir(bot.cog_dir):
-        # Determine if file is a python file
-        if filename.endswith("py"):
-            # Don't load it if it's in the blocklist (untested)
-            if filename[:-3] in bot.cog_blacklist:
-                pass
-            else:
-                # We load it into the bot
-                await bot.load_extension(f"commands.{filename[:-3]}")
-                print(f"[INIT] Loaded normal cog: {filename}")
-    
-    print("[INIT] Loaded normal cogs.\n")
-    
-    # Read cogs from private commands folder if it exists
-    if os.path.exists(f"{path}{pathtype}commands_private{pathtype}"):
-        print("[INIT] Loading private cogs...")
-        # Find all cogs in private command dir
-        for filename in os.listdir(f"{path}{pathtype}commands_private{pathtype}"):
+        pathtype = "/"
+        print(f"[INIT] OS name is {os.name}, path type {pathtype}\n")
+
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    bot = TitaniumBot(intents = intents, command_prefix = '')
+
+    print("[INIT] Reading config files.")
+
+    # Read config files
+    readconfigfile('config.cfg')
+
+    # Config File Vars
+    try:
+        bot.path = path
+        bot.pathtype = pathtype
+
+        bot.token = tokens_dict['discord-bot-token']
+        bot.spotify_id = tokens_dict['spotify-api-id']
+        bot.spotify_secret = tokens_dict['spotify-api-secret']
+
+        bot.dev_ids_str = options_dict['owner-ids'].split(",")
+        bot.support_server = options_dict['support-server']
+        bot.cog_blacklist = options_dict['cog-blacklist']
+        # bot.blocked_ids_str = options_dict['user-blacklist'].split(",")
+
+        if options_dict['cog-dir'] == '':
+            bot.cog_dir = f"{path}{pathtype}commands{pathtype}"
+        else:
+            bot.cog_dir = options_dict['cog-dir']
+
+        # Colour deadline is optional, older config files don't have it
+        if options_dict.get('color-deadline', '') == '':
+            bot.color_deadline = 1.5
+        else:
+            bot.color_deadline = float(options_dict['color-deadline'])
+
+        if options_dict['sync-on-start'] == 'True':
+            bot.sync_on_start = True
+        else:
+            bot.sync_on_start = False
+
+        # Convert Dev IDs from str to int
+        bot.dev_ids = []
+        for id in bot.dev_ids_str:
+            bot.dev_ids.append(int(id))
+
+        ## Convert Dev IDs from str to int
+        # bot.blocked_ids = []
+        # for id in bot.blocked_ids_str:
+            # bot.blocked_ids.append(int(id))
+
+        print("[INIT] Config files read.\n")
+    except Exception as error:
+        print("[INIT] Bad value in config file! Exiting.")
+        print(error)
+        exit()
+
+    # Sync bot cogs when started
+    @bot.event
+    async def on_ready():
+        # support_invite = await bot.fetch_invite(bot.support_server)
+        # control_server = support_invite.guild
+        # bot.control_server_id = control_server.id
+
+        print("[INIT] Loading cogs...")
+        # Find all cogs in command dir
+        for filename in os.listdir(bot.cog_dir):
             # Determine if file is a python file
             if filename.endswith("py"):
-                # Don't load it if it's in the blocklist
+                # Don't load it if it's in the blocklist (untested)
                 if filename[:-3] in bot.cog_blacklist:
                     pass
                 else:
                     # We load it into the bot
-                    await bot.load_extension(f"commands_private.{filename[:-3]}")
-                    print(f"[INIT] Loaded private cog: {filename}")
-
-        print("[INIT] Loaded private cogs.\n")
-    else:
-        print("[INIT] Skipping private cogs.\n")
+                    await bot.load_extension(f"commands.{filename[:-3]}")
+                    print(f"[INIT] Loaded normal cog: {filename}")
+
+        print("[INIT] Loaded normal cogs.\n")
+
+        # Read cogs from private commands folder if it exists
+        if os.path.exists(f"{path}{pathtype}commands_private{pathtype}"):
+            print("[INIT] Loading private cogs...")
+            # Find all cogs in private command dir
+            for filename in os.listdir(f"{path}{pathtype}commands_private{pathtype}"):
+                # Determine if file is a python file
+                if filename.endswith("py"):
+                    # Don't load it if it's in the blocklist
+                    if filename[:-3] in bot.cog_blacklist:
+                        pass
+                    else:
+                        # We load it into the bot
+                        await bot.load_extension(f"commands_private.{filename[:-3]}")
+                        print(f"[INIT] Loaded private cog: {filename}")
+
+            print("[INIT] Loaded private cogs.\n")
+        else:
+            print("[INIT] Skipping private cogs.\n")
+
+        # Sync tree if sync on start is enabled
+        if bot.sync_on_start == True:
+            print("[INIT] Syncing command tree...")
+            sync = await bot.tree.sync()
+            print(f"[INIT] Command tree synced. {len(sync)} commands loaded.")
+        else:
+            print("[INIT] Skipping command tree sync. Please manually sync commands later.")
+
+        print(f"[INIT] Bot is ready and connected as {bot.user}.")
+
+    # Ignore normal user messages
+    @bot.event
+    async def on_message(message):
+        pass
+
+    # Cooldown / No Permissions Handler
+    @bot.tree.error
+    async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError) -> None:
+        await interaction.response.defer(ephemeral=True)
+        if isinstance(error, discord.app_commands.errors.CommandOnCooldown):
+            embed = discord.Embed(title = "Cooldown", description = error, color = Color.red())
+            msg = await interaction.followup.send(embed = embed, ephemeral = True)
+            await asyncio.sleep(5)
+            await msg.delete()
+        elif isinstance(error, discord.app_commands.errors.MissingPermissions):
+            embed = discord.Embed(title = "Missing Permissions", description = error, color = Color.red())
+            msg = await interaction.followup.send(embed = embed, ephemeral = True)
+            await asyncio.sleep(5)
+            await msg.delete()
 
-    # Sync tree if sync on start is enabled
-    if bot.sync_on_start == True:
-        print("[INIT] Syncing command tree...")
-        sync = await bot.tree.sync()
-        print(f"[INIT] Command tree synced. {len(sync)} commands loaded.")
-    else:
-        print("[INIT] Skipping command tree sync. Please manually sync commands later.")
-
-    print(f"[INIT] Bot is ready and connected as {bot.user}.")
-
-# Ignore normal user messages
-@bot.event
-async def on_message(message):
-    pass
-
-# Cooldown / No Permissions Handler
-@bot.tree.error
-async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError) -> None:
-    await interaction.response.defer(ephemeral=True)
-    if isinstance(error, discord.app_commands.errors.CommandOnCooldown):
-        embed = discord.Embed(title = "Cooldown", description = error, color = Color.red())
-        msg = await interaction.followup.send(embed = embed, ephemeral = True)
-        await asyncio.sleep(5)
-        await msg.delete()
-    elif isinstance(error, discord.app_commands.errors.MissingPermissions):
-        embed = discord.Embed(title = "Missing Permissions", description = error, color = Color.red())
-        msg = await interaction.followup.send(embed = embed, ephemeral = True)
-        await asyncio.sleep(5)
-        await msg.delete()
-
-try:
-    # Run bot with token
-    bot.run(bot.token, log_handler=handler, log_level=logging.CRITICAL)
-except discord.errors.PrivilegedIntentsRequired:
-    print("[FATAL] Bot is missing the Message Content and/or Server Members intent! Please enable it in the Discord Developers web portal. Exiting...")
-    exit()
+    try:
+        # Run bot with token
+        bot.run(bot.token, log_handler=handler, log_level=logging.CRITICAL)
+    except discord.errors.PrivilegedIntentsRequired:
+        print("[FATAL] Bot is missing the Message Content and/or Server Members intent! Please enable it in the Discord Developers web portal. Exiting...")
+        exit()
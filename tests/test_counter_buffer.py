@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from lib.counter_buffer import CounterBuffer
+
+class SlowStore:
+    """Records batches from a thread, like LeaderboardStore, taking `delay` seconds per write."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.batches = []
+        self.started = threading.Event()
+
+    def _write(self, counts):
+        self.started.set()
+        time.sleep(self.delay)
+        self.batches.append(counts)
+
+    async def write(self, counts):
+        await asyncio.get_running_loop().run_in_executor(None, self._write, counts)
+
+    def totals(self):
+        totals = {}
+        for counts in self.batches:
+            for key, values in counts.items():
+                totals[key] = [a + b for a, b in zip(totals.get(key, [0] * len(values)), values)]
+        return totals
+
+class CounterBufferTests(unittest.IsolatedAsyncioTestCase):
+    async def test_close_during_timer_flush_writes_once(self):
+        store = SlowStore()
+        buffer = CounterBuffer(store.write, interval = 0.01)
+        buffer.add(("g", "u"), 1, 2, 3)
+        buffer.start()
+
+        # Close while the timer's write is running in the thread
+        await asyncio.get_running_loop().run_in_executor(None, store.started.wait)
+        await buffer.close()
+
+        self.assertEqual(store.totals(), {("g", "u"): [1, 2, 3]})
+        self.assertEqual(len(buffer), 0)
+
+    async def test_cancelled_caller_does_not_requeue(self):
+        store = SlowStore()
+        buffer = CounterBuffer(store.write)
+        buffer.add(("g", "u"), 1, 2, 3)
+
+        flush = asyncio.ensure_future(buffer.flush())
+        await asyncio.get_running_loop().run_in_executor(None, store.started.wait)
+        flush.cancel()
+        buffer.add(("g", "u"), 1, 0, 0)
+        await buffer.close()
+
+        self.assertEqual(store.totals(), {("g", "u"): [2, 2, 3]})
+
+    async def test_failed_write_is_retried(self):
+        batches = []
+
+        async def write(counts):
+            if batches == []:
+                batches.append(None)
+                raise OSError("disk full")
+            batches.append(counts)
+
+        buffer = CounterBuffer(write)
+        buffer.add(("g", "u"), 1, 2, 3)
+
+        with self.assertRaises(OSError):
+            await buffer.flush()
+
+        buffer.add(("g", "u"), 1, 0, 0)
+        await buffer.flush()
+
+        self.assertEqual(batches[1], {("g", "u"): [2, 2, 3]})
+
+if __name__ == "__main__":
+    unittest.main()